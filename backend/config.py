@@ -20,11 +20,18 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "gpt-5.2"
     LLM_TEMPERATURE: float = 0.2
     LLM_MAX_TOKENS: int = 4096
+    LLM_MAX_CONNECTIONS: int = 64            # pooled HTTP connections to the provider
+    LLM_MAX_INFLIGHT: int = 16               # concurrent requests across the process
+    LLM_REQUESTS_PER_MINUTE: int = 0         # 0 = unpaced, else the provider's RPM
+    LLM_MAX_RETRIES: int = 4                 # SDK retries, backing off on 429/5xx
+    LLM_CACHE: bool = False                  # replay identical JSON calls from disk
+    LLM_CACHE_DIR: str = ".llm_cache"
 
     # --- Deep dive settings ---
     DEEP_DIVE_PASSES_XLSX: int = 3
     DEEP_DIVE_PASSES_DEFAULT: int = 2
     MAX_QUESTIONS_PER_FILE: int = 5
+    MAX_CONCURRENT_DEEP_DIVES: int = 8       # files analysed in parallel
 
     # --- Question backlog ---
     MAX_OPEN_QUESTIONS: int = 8
@@ -12,6 +12,7 @@ from __future__ import annotations
 from langgraph.types import Send
 from langgraph.graph import END, START, StateGraph
 
+from backend.config import settings
 from backend.models.state import OffboardingState
 from backend.nodes.build_qa_context import build_qa_context
 from backend.nodes.concatenate import concatenate_deep_dives
@@ -28,7 +29,12 @@ from backend.graphs.subgraphs.file_deep_dive import file_deep_dive_subgraph
 # Fan-out: send each parsed file to its own deep-dive subgraph
 # ------------------------------------------------------------------
 def _fan_out_deep_dives(state: OffboardingState) -> list[Send]:
-    """Create one Send() per file for parallel deep-dive analysis."""
+    """Create one Send() per file for parallel deep-dive analysis.
+
+    LangGraph runs every Send of a superstep concurrently; the compiled
+    graphs cap that at settings.MAX_CONCURRENT_DEEP_DIVES so large
+    uploads don't exceed provider rate limits.
+    """
     files = state.get("structured_files", [])
     session_id = state.get("session_id", "")
     return [
@@ -99,7 +105,7 @@ def build_offboarding_graph():
     builder.add_edge("generate_onboarding_package", END)
     builder.add_edge("build_qa_context", END)
 
-    return builder.compile()
+    return _with_concurrency_cap(builder.compile())
 
 
 def build_deep_dive_only_graph():
@@ -129,4 +135,15 @@ def build_deep_dive_only_graph():
     builder.add_edge("global_summarize", "reconcile_questions")
     builder.add_edge("reconcile_questions", END)
 
-    return builder.compile()
+    return _with_concurrency_cap(builder.compile())
+
+
+def _with_concurrency_cap(graph):
+    """Bound how many fanned-out deep dives run at once."""
+    return graph.with_config(max_concurrency=settings.MAX_CONCURRENT_DEEP_DIVES)
+
+
+# Pre-built instances for import — compiled graphs hold no per-run state,
+# so every session can share them.
+OFFBOARDING_GRAPH = build_offboarding_graph()
+DEEP_DIVE_ONLY_GRAPH = build_deep_dive_only_graph()
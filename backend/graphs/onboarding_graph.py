@@ -223,3 +223,7 @@ def build_onboarding_graph():
     # Knowledge graph is NOT a graph node — generated on-demand via API
 
     return builder.compile()
+
+
+# Pre-built instance for import
+ONBOARDING_GRAPH = build_onboarding_graph()
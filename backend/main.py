@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import logging
 import sys
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
@@ -18,6 +19,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
 from backend.routes import interview, offboarding, onboarding, session
+from backend.services.llm import close_client
 
 # ------------------------------------------------------------------
 # Logging
@@ -40,10 +42,18 @@ if not settings.OPENAI_API_KEY:
 # ------------------------------------------------------------------
 # App
 # ------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the pooled LLM client on shutdown."""
+    yield
+    await close_client()
+
+
 app = FastAPI(
     title="Golden Gate — Knowledge Transfer Agent",
     version="0.1.0",
     description="Offboarding → Onboarding knowledge capture pipeline",
+    lifespan=lifespan,
 )
 
 # CORS — allow the Next.js frontend
@@ -81,6 +91,9 @@ def start():
         "backend.main:app",
         host=settings.HOST,
         port=settings.PORT,
+        # uvloop ships with uvicorn[standard]; ask for it explicitly so a
+        # missing install fails loudly instead of falling back to asyncio.
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
         reload=True,
         reload_dirs=["backend"],
     )
@@ -37,13 +37,15 @@ async def concatenate_deep_dives(state: OffboardingState) -> dict:
         if existing is None or r.pass_number > existing.pass_number:
             latest_by_file[r.file_id] = r
 
-    # Build corpus text
-    corpus_sections: list[str] = []
+    # Build corpus text — every section writes into one flat line buffer
+    # so the whole corpus is produced by a single join.
+    corpus_lines: list[str] = []
     all_questions: list[Question] = []
 
     for file_id, report in latest_by_file.items():
-        section = _format_report_section(report)
-        corpus_sections.append(section)
+        if corpus_lines:
+            corpus_lines.extend(("", "---", ""))
+        _append_report_section(corpus_lines, report)
 
         # Convert report questions to Question objects
         for q_data in report.questions:
@@ -56,7 +58,7 @@ async def concatenate_deep_dives(state: OffboardingState) -> dict:
             )
             all_questions.append(q)
 
-    corpus = "\n\n---\n\n".join(corpus_sections)
+    corpus = "\n".join(corpus_lines)
 
     # Persist
     store.save_json("deep_dive_corpus.json", {"corpus": corpus})
@@ -74,9 +76,9 @@ async def concatenate_deep_dives(state: OffboardingState) -> dict:
     }
 
 
-def _format_report_section(report: DeepDiveReport) -> str:
-    """Format a single DeepDiveReport as a readable text section."""
-    lines = [
+def _append_report_section(lines: list[str], report: DeepDiveReport) -> None:
+    """Append a single DeepDiveReport to *lines* as a readable text section."""
+    lines.extend((
         f"## File: {report.file_id}",
         f"**Purpose:** {report.file_purpose_summary}",
         "",
@@ -88,5 +90,4 @@ def _format_report_section(report: DeepDiveReport) -> str:
         "",
         "**At-Risk Knowledge:**",
         *[f"- {k}" for k in report.at_risk_knowledge],
-    ]
-    return "\n".join(lines)
+    ))
@@ -9,7 +9,11 @@ LLM-assisted step that:
 
 from __future__ import annotations
 
+import functools
 import logging
+from collections import Counter
+
+import fastjsonschema
 
 from backend.config import settings
 from backend.models.questions import (
@@ -23,6 +27,31 @@ from backend.services.storage import SessionStorage
 
 logger = logging.getLogger(__name__)
 
+# One entry of the LLM's "reconciled" list.  Compiled once at import;
+# entries that don't match are dropped before any decision is applied.
+# action and priority are deliberately loose: a missing or unknown action
+# means keep, and an unknown priority leaves the question's own.
+DECISION_SCHEMA = {
+    "type": "object",
+    "required": ["question_id"],
+    "properties": {
+        "question_id": {"type": "string"},
+        "merged_into": {"type": "string"},
+        "answer": {"type": "string"},
+    },
+}
+_validate_decision = fastjsonschema.compile(DECISION_SCHEMA)
+
+_PRIORITY_BY_VALUE = {p.value: p for p in QuestionPriority}
+
+
+def _is_valid_decision(decision: object) -> bool:
+    try:
+        _validate_decision(decision)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
 SYSTEM_PROMPT = """\
 You are a question backlog manager for a knowledge-transfer project. \
 Your job is to clean up a raw list of questions before they go to an \
@@ -72,6 +101,46 @@ knowledge that lives only in the departing employee's head. \
 Deprioritize or answer questions about things that are self-evident from the code/docs."""
 
 
+@functools.lru_cache(maxsize=32)
+def _format_evidence(corpus: str, global_summary: str) -> str:
+    """Corpus (truncated to fit the prompt) + global summary section.
+
+    Cached so re-runs over the same session corpus skip the slice + format.
+    """
+    max_corpus = 6000
+    corpus_for_prompt = (
+        corpus[:max_corpus] + "\n... [truncated]"
+        if len(corpus) > max_corpus
+        else corpus
+    )
+    return (
+        f"Here is the evidence corpus:\n\n{corpus_for_prompt}\n\n"
+        f"Here is the global summary:\n\n{global_summary}\n\n"
+    )
+
+
+def _build_user_prompt(
+    questions: list[Question], corpus: str, global_summary: str,
+) -> str:
+    """User prompt for the backlog; the evidence section comes first."""
+    questions_text = "\n".join(
+        f"- [{q.question_id}] ({q.origin.value}, {q.priority.value}): {q.question_text}"
+        for q in questions
+    )
+    return (
+        f"{_format_evidence(corpus, global_summary)}"
+        f"Here is the current question backlog ({len(questions)} questions):\n\n"
+        f"{questions_text}\n\n"
+        "For each question:\n"
+        "- If two questions ask the same thing, merge them (keep the better one).\n"
+        "- If the evidence clearly answers a question, mark it answered and "
+        "provide the answer.\n"
+        "- Assign priority: P0 (total knowledge loss risk), P1 (partial), "
+        "P2 (nice-to-have).\n"
+        f"- Keep at most {settings.MAX_OPEN_QUESTIONS} open questions."
+    )
+
+
 async def reconcile_questions(state: OffboardingState) -> dict:
     """Deduplicate, auto-resolve, and reprioritize the question backlog.
 
@@ -87,102 +156,90 @@ async def reconcile_questions(state: OffboardingState) -> dict:
     store = SessionStorage(session_id)
 
     if not backlog:
-        store.save_json("question_backlog.json", [])
+        await store.save_json_async("question_backlog.json", [])
         return {
             "question_backlog": [],
             "status": "questions_ready",
             "current_step": "reconcile_questions",
         }
 
-    # Build the question list for the LLM
-    questions_text = "\n".join(
-        f"- [{q.question_id}] ({q.origin.value}, {q.priority.value}): {q.question_text}"
-        for q in backlog
-    )
-
-    # Truncate corpus if too long to fit in prompt
-    max_corpus = 6000
-    corpus_for_prompt = (
-        corpus[:max_corpus] + "\n... [truncated]"
-        if len(corpus) > max_corpus
-        else corpus
-    )
-
     system = SYSTEM_PROMPT.replace("{max_open}", str(settings.MAX_OPEN_QUESTIONS))
 
-    user_prompt = (
-        f"Here is the current question backlog ({len(backlog)} questions):\n\n"
-        f"{questions_text}\n\n"
-        f"Here is the evidence corpus:\n\n{corpus_for_prompt}\n\n"
-        f"Here is the global summary:\n\n{global_summary}\n\n"
-        "For each question:\n"
-        "- If two questions ask the same thing, merge them (keep the better one).\n"
-        "- If the evidence clearly answers a question, mark it answered and provide the answer.\n"
-        "- Assign priority: P0 (total knowledge loss risk), P1 (partial), P2 (nice-to-have).\n"
-        f"- Keep at most {settings.MAX_OPEN_QUESTIONS} open questions."
-    )
-
+    # One call for the whole backlog: duplicates can only be merged when
+    # they share a prompt, and the open-question cap is global.
+    user_prompt = _build_user_prompt(backlog, corpus, global_summary)
     result = await call_llm_json(system, user_prompt)
     reconciled = result.get("reconciled", [])
 
-    # Build a lookup for the LLM decisions
-    decisions = {r["question_id"]: r for r in reconciled}
-
-    # Apply decisions to the backlog
-    updated: list[Question] = []
+    # Build a lookup for the LLM decisions, skipping malformed ones
+    # (missing id, non-string answer) — those questions stay as-is
+    valid = [r for r in reconciled if _is_valid_decision(r)]
+    if len(valid) < len(reconciled):
+        logger.warning(
+            "Dropped %d malformed reconcile decisions for session %s",
+            len(reconciled) - len(valid), session_id,
+        )
+    decisions = {r["question_id"]: r for r in valid}
+
+    # Apply decisions and split open/closed in the same pass.  Changed
+    # questions are copies: the incoming backlog is never mutated.
+    open_qs: list[Question] = []
+    closed_qs: list[Question] = []
     for q in backlog:
         decision = decisions.get(q.question_id)
-        if not decision:
-            # LLM didn't mention this question — keep as-is
-            updated.append(q)
-            continue
-
-        action = decision.get("action", "keep")
-
-        if action == "merge":
-            q.status = QuestionStatus.MERGED
-            updated.append(q)
-
-        elif action == "answer":
-            q.status = QuestionStatus.ANSWERED_BY_FILES
-            q.answer = decision.get("answer", "")
-            updated.append(q)
-
-        else:  # keep
-            priority_str = decision.get("priority", q.priority.value)
-            try:
-                q.priority = QuestionPriority(priority_str)
-            except ValueError:
-                pass
-            updated.append(q)
+        # No decision: LLM didn't mention this question — keep as-is
+        if decision:
+            action = decision.get("action", "keep")
 
-    # Cap open questions at MAX_OPEN_QUESTIONS
-    open_qs = [q for q in updated if q.status == QuestionStatus.OPEN]
-    closed_qs = [q for q in updated if q.status != QuestionStatus.OPEN]
+            if action == "merge":
+                q = q.model_copy(update={"status": QuestionStatus.MERGED})
+
+            elif action == "answer":
+                q = q.model_copy(update={
+                    "status": QuestionStatus.ANSWERED_BY_FILES,
+                    "answer": decision.get("answer", ""),
+                })
+
+            else:  # keep; unknown priority strings leave the original
+                priority = _PRIORITY_BY_VALUE.get(
+                    str(decision.get("priority")), q.priority
+                )
+                if priority != q.priority:
+                    q = q.model_copy(update={"priority": priority})
 
+        (open_qs if q.status == QuestionStatus.OPEN else closed_qs).append(q)
+
+    # Cap open questions at MAX_OPEN_QUESTIONS
     if len(open_qs) > settings.MAX_OPEN_QUESTIONS:
-        priority_order = {QuestionPriority.P0: 0, QuestionPriority.P1: 1, QuestionPriority.P2: 2}
-        open_qs.sort(key=lambda q: priority_order.get(q.priority, 9))
-        kept = open_qs[:settings.MAX_OPEN_QUESTIONS]
-        for q in open_qs[settings.MAX_OPEN_QUESTIONS:]:
-            q.status = QuestionStatus.DEPRIORITIZED
-            closed_qs.append(q)
-        open_qs = kept
+        # Only three priorities: bucket in one pass (same order as a stable
+        # sort P0 → P1 → P2) and drop the tail.
+        buckets: dict[QuestionPriority, list[Question]] = {
+            p: [] for p in QuestionPriority
+        }
+        for q in open_qs:
+            buckets[q.priority].append(q)
+        open_qs = [q for p in QuestionPriority for q in buckets[p]]
+        closed_qs.extend(
+            q.model_copy(update={"status": QuestionStatus.DEPRIORITIZED})
+            for q in open_qs[settings.MAX_OPEN_QUESTIONS:]
+        )
+        del open_qs[settings.MAX_OPEN_QUESTIONS:]
 
     final_backlog = open_qs + closed_qs
 
-    store.save_json(
+    await store.save_json_async(
         "question_backlog.json",
         [q.model_dump() for q in final_backlog],
     )
 
-    open_count = len([q for q in final_backlog if q.status == QuestionStatus.OPEN])
-    merged_count = len([q for q in final_backlog if q.status == QuestionStatus.MERGED])
-    answered_count = len([q for q in final_backlog if q.status == QuestionStatus.ANSWERED_BY_FILES])
+    status_counts = Counter(q.status for q in final_backlog)
 
     logger.info(
         "Reconciled questions for session %s: %d total → %d open, %d merged, %d auto-answered",
-        session_id, len(backlog), open_count, merged_count, answered_count,
+        session_id, len(backlog),
+        status_counts[QuestionStatus.OPEN],
+        status_counts[QuestionStatus.MERGED],
+        status_counts[QuestionStatus.ANSWERED_BY_FILES],
     )
 
     return {
@@ -21,7 +21,7 @@ from fastapi.responses import FileResponse
 from sse_starlette.sse import EventSourceResponse
 
 from backend.config import settings
-from backend.graphs.offboarding_graph import build_deep_dive_only_graph
+from backend.graphs.offboarding_graph import DEEP_DIVE_ONLY_GRAPH
 from backend.services.storage import SessionStorage, create_session
 
 DEMO_DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
@@ -276,15 +276,16 @@ async def start_offboarding(
     store = create_session(project_name, role, timeline)
     session_id = store.session_id
 
-    # Save uploaded files
+    # Save uploaded files, streaming each spooled upload to disk rather than
+    # reading it into memory first
     for f in files:
-        content = await f.read()
-        store.save_uploaded_file(f.filename or "unknown", content)
-        logger.info("Saved file: %s (%d bytes)", f.filename, len(content))
+        dest = await store.save_uploaded_file_async(f.filename or "unknown", f.file)
+        logger.info("Saved file: %s (%d bytes)", f.filename, dest.stat().st_size)
 
-    # Build truncated graph (parse → deep dives → concatenate only).
-    # The full graph requires a checkpointer for interview_loop's interrupt().
-    graph = build_deep_dive_only_graph()
+    # Truncated graph (parse → deep dives → concatenate only), compiled once
+    # at import.  The full graph requires a checkpointer for interview_loop's
+    # interrupt().
+    graph = DEEP_DIVE_ONLY_GRAPH
     initial_state = {
         "session_id": session_id,
         "project_metadata": {
@@ -14,26 +14,83 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
 import logging
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from backend.config import settings
+from backend.services.llm_cache import cache_key, get_cache
 
 logger = logging.getLogger(__name__)
 
 _client: AsyncOpenAI | None = None
+_inflight: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+_next_request_at = 0.0
+_pending: dict[str, asyncio.Future] = {}
+
+
+class _OwnerCancelled(Exception):
+    """Set on a coalesced future when the task that owned the call is cancelled."""
 
 
 def _get_client() -> AsyncOpenAI:
+    """Return the process-wide client.
+
+    One client means one connection pool: concurrent calls share
+    keep-alive connections instead of paying a TLS handshake each.
+    """
     global _client
     if _client is None:
-        _client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        limits = httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+        )
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=settings.LLM_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(limits=limits),
+        )
     return _client
 
 
+async def close_client() -> None:
+    """Close the pooled client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+@asynccontextmanager
+async def _request_slot() -> AsyncIterator[None]:
+    """Hold one of LLM_MAX_INFLIGHT slots, paced to LLM_REQUESTS_PER_MINUTE.
+
+    Graph fan-out can put dozens of calls in flight at once; this keeps
+    them under the provider's rate limit instead of relying on 429
+    retries (the SDK still backs off with jitter if one slips through).
+    """
+    global _inflight, _next_request_at
+    loop = asyncio.get_running_loop()
+    if _inflight is None or _inflight[0] is not loop:
+        _inflight = (loop, asyncio.Semaphore(settings.LLM_MAX_INFLIGHT))
+
+    async with _inflight[1]:
+        if settings.LLM_REQUESTS_PER_MINUTE > 0:
+            now = time.monotonic()
+            start = max(now, _next_request_at)
+            _next_request_at = start + 60.0 / settings.LLM_REQUESTS_PER_MINUTE
+            if start > now:
+                await asyncio.sleep(start - now)
+        yield
+
+
 async def call_llm(
     system_prompt: str,
     user_prompt: str,
@@ -55,15 +112,18 @@ async def call_llm(
         The assistant's response as a string.
     """
     client = _get_client()
-    response = await client.chat.completions.create(
-        model=model or settings.LLM_MODEL,
-        temperature=temperature if temperature is not None else settings.LLM_TEMPERATURE,
-        max_completion_tokens=max_completion_tokens or settings.LLM_MAX_TOKENS,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-    )
+    async with _request_slot():
+        response = await client.chat.completions.create(
+            model=model or settings.LLM_MODEL,
+            temperature=(
+                temperature if temperature is not None else settings.LLM_TEMPERATURE
+            ),
+            max_completion_tokens=max_completion_tokens or settings.LLM_MAX_TOKENS,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
     return response.choices[0].message.content or ""
 
 
@@ -80,18 +140,73 @@ async def call_llm_json(
     Uses response_format=json_object to guarantee valid JSON output.
     Falls back to extracting JSON from markdown fences if the model
     doesn't support response_format.
+
+    When settings.LLM_CACHE is on, identical requests are answered from
+    the response cache (see services/llm_cache.py) without a network call.
+    Identical requests that arrive while one is already in flight wait for
+    that response instead of sending their own.
     """
-    client = _get_client()
-    response = await client.chat.completions.create(
-        model=model or settings.LLM_MODEL,
-        temperature=temperature if temperature is not None else settings.LLM_TEMPERATURE,
-        max_completion_tokens=max_completion_tokens or settings.LLM_MAX_TOKENS,
-        response_format={"type": "json_object"},
-        messages=[
+    request = {
+        "model": model or settings.LLM_MODEL,
+        "temperature": (
+            temperature if temperature is not None else settings.LLM_TEMPERATURE
+        ),
+        "max_completion_tokens": max_completion_tokens or settings.LLM_MAX_TOKENS,
+        "response_format": {"type": "json_object"},
+        "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
+    }
+    key = cache_key(
+        request["model"],
+        request["messages"],
+        temperature=request["temperature"],
+        max_tokens=request["max_completion_tokens"],
+        response_format=request["response_format"],
     )
+
+    if settings.LLM_CACHE:
+        cached = await get_cache().get_async(key)
+        if cached is not None:
+            logger.debug("LLM cache hit %s", key[:12])
+            return cached
+
+    # Waiters re-issue the call if the owner is cancelled: the owner's
+    # cancellation is not theirs, so it must not propagate to them.
+    while (pending := _pending.get(key)) is not None:
+        logger.debug("Joining in-flight LLM request %s", key[:12])
+        try:
+            return copy.deepcopy(await asyncio.shield(pending))
+        except _OwnerCancelled:
+            logger.debug("In-flight LLM request %s was cancelled, re-issuing", key[:12])
+
+    future = asyncio.get_running_loop().create_future()
+    _pending[key] = future
+    try:
+        data = await _request_json(request)
+    except Exception as exc:
+        future.set_exception(exc)
+        future.exception()  # mark retrieved — only waiters need to see it
+        raise
+    except BaseException:
+        future.set_exception(_OwnerCancelled())
+        future.exception()
+        raise
+    finally:
+        _pending.pop(key, None)
+
+    future.set_result(data)
+    if settings.LLM_CACHE:
+        await get_cache().set_async(key, data)
+    return copy.deepcopy(data)
+
+
+async def _request_json(request: dict[str, Any]) -> dict[str, Any]:
+    """Send a JSON-mode request and parse the response text."""
+    client = _get_client()
+    async with _request_slot():
+        response = await client.chat.completions.create(**request)
     raw = response.choices[0].message.content or ""
 
     # Try direct parse first
@@ -0,0 +1,121 @@
+"""LLM response cache — exact-match replay of identical JSON calls.
+
+Keyed by a SHA-256 of everything that determines the request
+(model, messages, temperature, token budget, response format).  Hits are
+served from an in-process LRU first, then from one JSON file per key
+under LLM_CACHE_DIR, so re-running a session during development or in
+CI costs no tokens.
+
+Opt-in via LLM_CACHE=1 (see backend/config.py).  call_llm_json() is the
+only caller — nodes never touch the cache directly.
+
+Usage:
+    from backend.services.llm_cache import cache_key, get_cache
+    key = cache_key(model, messages, temperature=0.2, max_tokens=4096)
+    hit = get_cache().get(key)              # sync callers
+    hit = await get_cache().get_async(key)  # from async code
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(
+    model: str,
+    messages: list[dict],
+    *,
+    temperature: float,
+    max_tokens: int,
+    response_format: dict | None = None,
+) -> str:
+    """Return a stable hex digest identifying one LLM request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Two-tier cache: bounded in-memory LRU in front of a directory of JSON files."""
+
+    def __init__(self, directory: str | Path, max_memory_entries: int = 256):
+        self.directory = Path(directory)
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # get_async/set_async run on worker threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached response, or None on a miss."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+        if value is not None:
+            return copy.deepcopy(value)
+
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Ignoring unreadable LLM cache entry %s", path)
+            return None
+        self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store a response in memory and on disk."""
+        self._remember(key, copy.deepcopy(value))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.json").write_text(
+            json.dumps(value, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    async def get_async(self, key: str) -> dict[str, Any] | None:
+        """get() on a worker thread so a disk read doesn't block the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: dict[str, Any]) -> None:
+        """set() on a worker thread so the disk write doesn't block the event loop."""
+        await asyncio.to_thread(self.set, key, value)
+
+    def _remember(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+_cache: LLMCache | None = None
+
+
+def get_cache() -> LLMCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMCache(settings.LLM_CACHE_DIR)
+    return _cache
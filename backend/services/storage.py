@@ -8,18 +8,26 @@ Usage:
     store = SessionStorage(session_id="abc123")
     store.save_json("parsed/file1.json", structured_file.model_dump())
     data = store.load_json("parsed/file1.json")
+
+    # From async nodes, keep the event loop free while writing:
+    await store.save_json_async("parsed/file1.json", structured_file.model_dump())
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 import shutil
 import uuid
 from pathlib import Path
+from typing import BinaryIO
+
+import orjson
 
 from backend.config import settings
 
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
 
 class SessionStorage:
     """File-based storage scoped to a single session."""
@@ -32,19 +40,16 @@ class SessionStorage:
     # ---------- JSON helpers ----------
 
     def save_json(self, relative_path: str, data: dict | list) -> Path:
-        """Write a dict/list as pretty-printed JSON."""
+        """Write a dict/list as pretty-printed UTF-8 JSON."""
         path = self.root / relative_path
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(
-            json.dumps(data, indent=2, default=str, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        path.write_bytes(orjson.dumps(data, default=str, option=_JSON_OPTIONS))
         return path
 
     def load_json(self, relative_path: str) -> dict | list:
         """Read a JSON file. Raises FileNotFoundError if missing."""
         path = self.root / relative_path
-        return json.loads(path.read_text(encoding="utf-8"))
+        return orjson.loads(path.read_bytes())
 
     def exists(self, relative_path: str) -> bool:
         return (self.root / relative_path).exists()
@@ -61,13 +66,25 @@ class SessionStorage:
         path = self.root / relative_path
         return path.read_text(encoding="utf-8")
 
+    # ---------- Async wrappers ----------
+
+    async def save_json_async(self, relative_path: str, data: dict | list) -> Path:
+        """save_json() on a worker thread so the event loop isn't blocked."""
+        return await asyncio.to_thread(self.save_json, relative_path, data)
+
+    async def save_text_async(self, relative_path: str, text: str) -> Path:
+        """save_text() on a worker thread so the event loop isn't blocked."""
+        return await asyncio.to_thread(self.save_text, relative_path, text)
+
     # ---------- File management ----------
 
     def save_uploaded_file(
-        self, filename: str, content: bytes,
+        self, filename: str, content: bytes | BinaryIO,
     ) -> Path:
         """Save an uploaded file to raw_files/.
 
+        ``content`` is either the raw bytes or a binary file object, which is
+        copied over in chunks instead of being read into memory first.
         Sanitises the filename to prevent directory traversal attacks.
         """
         # Strip directory components and null bytes
@@ -76,9 +93,19 @@ class SessionStorage:
             safe_name = "unnamed_file"
         dest = self.root / "raw_files" / safe_name
         dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_bytes(content)
+        if isinstance(content, bytes):
+            dest.write_bytes(content)
+        else:
+            with dest.open("wb") as out:
+                shutil.copyfileobj(content, out)
         return dest
 
+    async def save_uploaded_file_async(
+        self, filename: str, content: bytes | BinaryIO,
+    ) -> Path:
+        """save_uploaded_file() on a worker thread so the event loop isn't blocked."""
+        return await asyncio.to_thread(self.save_uploaded_file, filename, content)
+
     def list_raw_files(self) -> list[Path]:
         """Return sorted list of files in raw_files/ (directories excluded)."""
         raw_dir = self.root / "raw_files"
@@ -0,0 +1,308 @@
+"""Tests for the demo artifacts in public/artifacts/alice-chen/.
+
+The artifacts are standalone scripts, not part of the backend package, so
+each module is loaded from its file path.  Rewrites of these files must
+keep the results of the original per-row / scalar code.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_ARTIFACTS = Path(__file__).resolve().parents[2] / "public" / "artifacts" / "alice-chen"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(
+        f"alice_{name}", _ARTIFACTS / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ------------------------------------------------------------------
+# 1. loss_model.generate_quarterly_forecast
+# ------------------------------------------------------------------
+@pytest.fixture
+def loss_model():
+    pytest.importorskip("pandas")
+    return _load("loss_model")
+
+
+def _per_row_forecast(loss_model, portfolio_data):
+    """The original loop: one mask and one calculate_loss_forecast per segment."""
+    import pandas as pd
+
+    results = []
+    for segment in loss_model.SEGMENTS:
+        in_segment = portfolio_data['segment'] == segment
+        segment_data = {
+            'segment': segment,
+            'exposure': portfolio_data[in_segment]['exposure'].sum()
+        }
+        loss_rate = loss_model.calculate_loss_forecast(segment_data)
+        results.append({
+            'segment': segment,
+            'exposure': segment_data['exposure'],
+            'model_loss_rate': loss_rate,
+            'adjustment': 0,
+            'final_loss_rate': loss_rate,
+        })
+    return pd.DataFrame(results)
+
+
+def _portfolio():
+    import pandas as pd
+
+    # Unsorted, repeated segments, and no deep_subprime rows at all
+    return pd.DataFrame({
+        'segment': ['subprime', 'prime', 'near_prime', 'prime', 'subprime'],
+        'exposure': [200_000, 1_000_000, 500_000, 250_000, 75_000],
+    })
+
+
+def test_forecast_matches_per_row_loop(loss_model):
+    import pandas as pd
+
+    portfolio = _portfolio()
+    pd.testing.assert_frame_equal(
+        loss_model.generate_quarterly_forecast(portfolio),
+        _per_row_forecast(loss_model, portfolio),
+    )
+
+
+def test_forecast_follows_per_segment_logic(loss_model, monkeypatch):
+    """Changes to calculate_loss_forecast / apply_macro_factors carry through."""
+    import pandas as pd
+
+    monkeypatch.setattr(
+        loss_model, "apply_macro_factors",
+        lambda segment_data, macro_indicators=None: (
+            1.5 if segment_data['segment'] == 'prime' else 1.0
+        ),
+    )
+    portfolio = _portfolio()
+    forecast = loss_model.generate_quarterly_forecast(portfolio)
+
+    pd.testing.assert_frame_equal(forecast, _per_row_forecast(loss_model, portfolio))
+    assert forecast.loc[0, 'model_loss_rate'] == pytest.approx(0.023 * 1.5)
+
+
+@pytest.mark.parametrize("indicators, expected", [
+    ({}, 1.0),
+    ({"unemployment_delta": 0.5}, 1.05),
+    ({"fed_rate_delta": 1.0, "unemployment_delta": 0.5}, 1.1),
+    # unhashable values were accepted by the original loop; they skip the cache
+    ({"unemployment_delta": 0.5, "notes": ["q3 spike"]}, 1.05),
+])
+def test_apply_macro_factors(loss_model, indicators, expected):
+    assert loss_model.apply_macro_factors({}, indicators) == pytest.approx(expected)
+    assert loss_model.apply_macro_factors({}, None) == 1.0
+
+
+# ------------------------------------------------------------------
+# 2. threshold_config lookup tables and batch APIs
+# ------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def tc():
+    pytest.importorskip("numpy")
+    return _load("threshold_config")
+
+
+def _reference_should_escalate(impact_amount):
+    """The original if/elif chain."""
+    if impact_amount >= 10_000_000:
+        return "board"
+    elif impact_amount >= 5_000_000:
+        return "cfo"
+    elif impact_amount >= 2_000_000:
+        return "risk_committee"
+    return "none"
+
+
+def _reference_check_variance(expected, actual):
+    """The original if/elif chain."""
+    if expected == 0:
+        return "critical" if actual > 0 else "normal"
+    variance = abs(actual - expected) / expected
+    if variance >= 0.40:
+        return "critical"
+    elif variance >= 0.25:
+        return "action"
+    elif variance >= 0.15:
+        return "warning"
+    return "normal"
+
+
+NAN = float("nan")
+INF = float("inf")
+
+IMPACTS = [
+    -1.0, 0.0, 1_999_999.99, 2_000_000, 2_000_000.01, 4_999_999, 5_000_000,
+    9_999_999, 10_000_000, 1e12, INF, -INF, NAN,
+]
+
+# (expected, actual) pairs: every band, exact thresholds (expected=2.0 and
+# 4.0 keep the arithmetic exact), zero expected, and NaN on either side
+VARIANCE_PAIRS = [
+    (2.0, 2.0), (2.0, 2.2), (2.0, 2.3), (2.0, 1.7), (2.0, 2.5), (2.0, 1.5),
+    (2.0, 2.8), (2.0, 1.2), (2.0, 3.0), (4.0, 4.6), (4.0, 5.0), (4.0, 5.6),
+    (4.0, 0.0), (0.0, 0.0), (0.0, 1.0), (0.0, -1.0), (0.0, NAN),
+    (2.0, NAN), (NAN, 2.0), (NAN, NAN), (2.0, INF),
+]
+
+
+class TestEscalation:
+
+    @pytest.mark.parametrize("impact", IMPACTS)
+    def test_scalar_matches_original(self, tc, impact):
+        assert tc.should_escalate(impact) == _reference_should_escalate(impact)
+
+    @pytest.mark.parametrize("impact", IMPACTS)
+    def test_level_code_matches_label(self, tc, impact):
+        level = tc.escalation_level(impact)
+        assert isinstance(level, tc.EscLevel)
+        assert level.name.lower() == tc.should_escalate(impact)
+
+    def test_nan_is_none(self, tc):
+        import numpy as np
+
+        assert tc.should_escalate(NAN) == "none"
+        assert tc.escalation_level(NAN) is tc.EscLevel.NONE
+        assert tc.should_escalate_batch(np.array([NAN]))[0] == "none"
+
+    def test_batch_matches_scalar(self, tc):
+        import numpy as np
+
+        batch = tc.should_escalate_batch(np.array(IMPACTS))
+        assert batch.tolist() == [tc.should_escalate(x) for x in IMPACTS]
+
+    def test_batch_accepts_integer_amounts(self, tc):
+        import numpy as np
+
+        amounts = np.array([0, 2_000_000, 5_000_000, 10_000_000], dtype=np.int64)
+        assert tc.should_escalate_batch(amounts).tolist() == [
+            "none", "risk_committee", "cfo", "board",
+        ]
+
+
+class TestVariance:
+
+    @pytest.mark.parametrize("expected, actual", VARIANCE_PAIRS)
+    def test_scalar_matches_original(self, tc, expected, actual):
+        reference = _reference_check_variance(expected, actual)
+        assert tc.check_variance(expected, actual) == reference
+
+    @pytest.mark.parametrize("expected, actual", VARIANCE_PAIRS)
+    def test_level_code_matches_label(self, tc, expected, actual):
+        level = tc.variance_level(expected, actual)
+        assert isinstance(level, tc.VarLevel)
+        assert level.name.lower() == tc.check_variance(expected, actual)
+
+    @pytest.mark.parametrize("expected", [2.0, 4.0, 0.0, NAN])
+    def test_checker_matches_scalar(self, tc, expected):
+        check = tc.make_variance_checker(expected)
+        for _, actual in VARIANCE_PAIRS:
+            assert check(actual) == tc.check_variance(expected, actual), actual
+
+    def test_batch_matches_scalar(self, tc):
+        import numpy as np
+
+        expected, actual = map(np.array, zip(*VARIANCE_PAIRS))
+        batch = tc.check_variance_batch(expected, actual)
+        assert batch.tolist() == [tc.check_variance(e, a) for e, a in VARIANCE_PAIRS]
+
+    def test_batch_f32_matches_scalar(self, tc):
+        import numpy as np
+
+        # 2.0/4.0 cases land exactly on float64 thresholds, which float32 may
+        # round across (documented); keep only those clear of a boundary
+        pairs = [(e, a) for e, a in VARIANCE_PAIRS
+                 if e != e or e == 0 or a != a or a == INF
+                 or min(abs(abs(a - e) / e - t) for t in (0.15, 0.25, 0.40)) > 1e-3]
+        expected, actual = map(np.array, zip(*pairs))
+        batch = tc.check_variance_batch_f32(expected, actual)
+        assert batch.tolist() == [tc.check_variance(e, a) for e, a in pairs]
+
+    def test_nan_is_normal(self, tc):
+        import numpy as np
+
+        assert tc.check_variance(2.0, NAN) == "normal"
+        assert tc.variance_level(NAN, 2.0) is tc.VarLevel.NORMAL
+        batch = tc.check_variance_batch(np.array([2.0, NAN]), np.array([NAN, 2.0]))
+        assert batch.tolist() == ["normal", "normal"]
+        batch = tc.check_variance_batch_f32(np.array([2.0]), np.array([NAN]))
+        assert batch[0] == "normal"
+
+
+class TestSegments:
+
+    @pytest.mark.parametrize(
+        "segment", ["prime", "near_prime", "subprime", "deep_subprime"]
+    )
+    def test_segment_id_lookup_matches_name_lookup(self, tc, segment):
+        sid = tc.segment_id(segment)
+        assert isinstance(sid, tc.SegmentID)
+        assert tc.get_threshold_id(sid) == tc.get_threshold(segment)
+
+    def test_unknown_segment(self, tc):
+        assert tc.get_threshold("unknown") == tc._FAILSAFE_THRESHOLD
+        with pytest.raises(KeyError):
+            tc.segment_id("unknown")
+
+    def test_enum_codes_line_up_with_labels(self, tc):
+        assert [s.name.lower() for s in tc.SegmentID] == list(tc.SEGMENT_THRESHOLDS)
+        assert [v.name.lower() for v in tc.VarLevel] == list(tc._VAR_LABELS)
+        assert [e.name.lower() for e in tc.EscLevel] == list(tc._ESC_TIER_LABELS)
+
+
+@pytest.mark.parametrize("bucket", ["30_day", "60_day", "90_day"])
+def test_classify_delinquency_matches_config(tc, bucket):
+    """Table-driven against DELINQUENCY_THRESHOLDS, at and around each level."""
+    bucket_id = getattr(tc, f"DQ_{bucket.upper()}")
+    levels = tc.DELINQUENCY_THRESHOLDS[bucket]
+
+    def reference(rate):
+        if rate >= levels["high"]:
+            return "high"
+        elif rate >= levels["elevated"]:
+            return "elevated"
+        return "normal"
+
+    rates = [0.0, 1.0, NAN] + [
+        levels[level] + offset
+        for level in ("normal", "elevated", "high")
+        for offset in (-1e-9, 0.0, 1e-9)
+    ]
+    for rate in rates:
+        assert tc.classify_delinquency(bucket_id, rate) == reference(rate), rate
+    assert tc.classify_delinquency(bucket_id, levels["elevated"]) == "elevated"
+    assert tc.classify_delinquency(bucket_id, levels["high"]) == "high"
+
+
+def test_assess_portfolio_matches_per_row(tc):
+    import numpy as np
+
+    segments = ["prime", "near_prime", "subprime", "deep_subprime"]
+    rows = [
+        (e, a, impact, segments[i % 4])
+        for i, ((e, a), impact) in enumerate(zip(VARIANCE_PAIRS, IMPACTS * 2))
+    ]
+    expected, actual, impacts, names = zip(*rows)
+
+    variance, escalation, caps = tc.assess_portfolio(
+        np.array(expected), np.array(actual), np.array(impacts),
+        np.array([tc.segment_id(s) for s in names]),
+    )
+
+    assert variance.tolist() == [tc.check_variance(e, a) for e, a, _, _ in rows]
+    assert escalation.tolist() == [tc.should_escalate(x) for _, _, x, _ in rows]
+    for cap, name in zip(caps, names):
+        if tc.OVERLAY_CAPS[name] is None:
+            assert np.isnan(cap)
+        else:
+            assert cap == tc.OVERLAY_CAPS[name]
@@ -36,13 +36,18 @@ from backend.nodes.concatenate import concatenate_deep_dives
 # ------------------------------------------------------------------
 # Fixtures
 # ------------------------------------------------------------------
-def _make_file(file_id="test_file", file_type="xlsx", file_name="test.xlsx") -> StructuredFile:
-    return StructuredFile(
-        file_id=file_id,
-        file_name=file_name,
-        file_type=file_type,
-        parsed_content={"sheet1": {"A1": "Revenue", "A2": 100}},
-    )
+# Built once without validation; tests only read it, so per-test copies
+# share the parsed_content dict.
+_BASE_FILE = StructuredFile.model_construct(
+    file_id="test_file",
+    file_name="test.xlsx",
+    file_type="xlsx",
+    parsed_content={"sheet1": {"A1": "Revenue", "A2": 100}},
+)
+
+
+def _make_file(**overrides) -> StructuredFile:
+    return _BASE_FILE.model_copy(update=overrides) if overrides else _BASE_FILE
 
 
 def _make_report(file_id="test_file", pass_number=1) -> DeepDiveReport:
@@ -74,6 +74,34 @@ def test_storage_roundtrip(tmp_path, monkeypatch):
     assert meta["project_name"] == "Test Project"
 
 
+async def test_storage_async_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "backend.config.settings.SESSIONS_DIR", str(tmp_path)
+    )
+    from backend.services.storage import SessionStorage
+
+    store = SessionStorage("async-session")
+    await store.save_json_async("test/data.json", {"key": "value"})
+    await store.save_text_async("test/notes.md", "# Notes")
+    assert store.load_json("test/data.json") == {"key": "value"}
+    assert store.load_text("test/notes.md") == "# Notes"
+
+
+def test_save_uploaded_file_from_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "backend.config.settings.SESSIONS_DIR", str(tmp_path)
+    )
+    import io
+
+    from backend.services.storage import SessionStorage
+
+    store = SessionStorage("upload-session")
+    payload = b"x" * (3 * 1024 * 1024 + 7)
+    dest = store.save_uploaded_file("../big.bin", io.BytesIO(payload))
+    assert dest == tmp_path / "upload-session" / "raw_files" / "big.bin"
+    assert dest.read_bytes() == payload
+
+
 # ------------------------------------------------------------------
 # 4. FastAPI app creates without errors
 # ------------------------------------------------------------------
@@ -82,7 +110,7 @@ def test_fastapi_app_creates():
 
     assert app.title == "Golden Gate — Knowledge Transfer Agent"
     # Verify routes are registered
-    route_paths = [r.path for r in app.routes]
+    route_paths = app.openapi()["paths"]
     assert "/api/health" in route_paths
     assert "/api/offboarding/start" in route_paths
     assert "/api/onboarding/{session_id}/ask" in route_paths
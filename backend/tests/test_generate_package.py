@@ -41,7 +41,8 @@ def _make_question(
     priority=QuestionPriority.P1,
     answer="The rate is based on 5-year average.",
 ) -> Question:
-    return Question(
+    # Inputs are known-good enum members: skip Pydantic validation
+    return Question.model_construct(
         question_id=qid,
         question_text=f"Why was this value chosen? ({qid})",
         origin=QuestionOrigin.PER_FILE,
@@ -191,118 +192,91 @@ class TestPackageToMarkdown(unittest.TestCase):
 # ==================================================================
 # 2. MAIN NODE — LLM CALL INPUTS
 # ==================================================================
-class TestGeneratePackageLLMInputs(unittest.IsolatedAsyncioTestCase):
-    """Verify that the LLM calls receive correct prompt content."""
+class _GeneratePackageNodeTest(unittest.IsolatedAsyncioTestCase):
+    """Patches storage + LLM once per test via setUp instead of decorators.
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_knowledge_entries_prompt_includes_interview_summary(
-        self, mock_llm, mock_storage_cls
-    ):
-        """LLM call 1 should include interview_summary in the prompt."""
-        mock_llm.side_effect = [
+    The LLM mock answers the knowledge-entry call then the doc call;
+    tests needing other responses overwrite side_effect.
+    """
+
+    def setUp(self):
+        storage_patcher = patch(
+            "backend.nodes.generate_package.SessionStorage", autospec=True,
+        )
+        self.mock_storage_cls = storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+
+        llm_patcher = patch(
+            "backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock,
+        )
+        self.mock_llm = llm_patcher.start()
+        self.addCleanup(llm_patcher.stop)
+        self.mock_llm.side_effect = [
             _mock_knowledge_entries_response(),
             _mock_onboarding_doc_response(),
         ]
 
+
+class TestGeneratePackageLLMInputs(_GeneratePackageNodeTest):
+    """Verify that the LLM calls receive correct prompt content."""
+
+    async def test_knowledge_entries_prompt_includes_interview_summary(self):
+        """LLM call 1 should include interview_summary in the prompt."""
         state = _make_state()
         await generate_onboarding_package(state)
 
         # First call is knowledge entries
-        ke_call = mock_llm.call_args_list[0]
+        ke_call = self.mock_llm.call_args_list[0]
         ke_user_prompt = ke_call[0][1]  # second positional arg
 
         self.assertIn("interview summary", ke_user_prompt.lower())
         self.assertIn("rate was chosen based on historical data", ke_user_prompt)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_knowledge_entries_prompt_includes_facts(
-        self, mock_llm, mock_storage_cls
-    ):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
+    async def test_knowledge_entries_prompt_includes_facts(self):
         state = _make_state()
         await generate_onboarding_package(state)
 
-        ke_user_prompt = mock_llm.call_args_list[0][0][1]
+        ke_user_prompt = self.mock_llm.call_args_list[0][0][1]
         self.assertIn("Rate based on 5-year avg", ke_user_prompt)
         self.assertIn("Q4 needs manual override", ke_user_prompt)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_doc_prompt_includes_interview_summary(
-        self, mock_llm, mock_storage_cls
-    ):
+    async def test_doc_prompt_includes_interview_summary(self):
         """LLM call 2 should include interview_summary in the prompt."""
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
         state = _make_state()
         await generate_onboarding_package(state)
 
         # Second call is onboarding doc
-        doc_call = mock_llm.call_args_list[1]
+        doc_call = self.mock_llm.call_args_list[1]
         doc_user_prompt = doc_call[0][1]
 
         self.assertIn("Interview Summary", doc_user_prompt)
         self.assertIn("rate was chosen based on historical data", doc_user_prompt)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_doc_prompt_includes_corpus_and_global_summary(
-        self, mock_llm, mock_storage_cls
-    ):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
+    async def test_doc_prompt_includes_corpus_and_global_summary(self):
         state = _make_state()
         await generate_onboarding_package(state)
 
-        doc_user_prompt = mock_llm.call_args_list[1][0][1]
+        doc_user_prompt = self.mock_llm.call_args_list[1][0][1]
         self.assertIn("revenue forecasting model", doc_user_prompt.lower())
         self.assertIn("Global Summary", doc_user_prompt)
         self.assertIn("manual overrides", doc_user_prompt)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_doc_prompt_mentions_remix(
-        self, mock_llm, mock_storage_cls
-    ):
+    async def test_doc_prompt_mentions_remix(self):
         """The prompt should ask the LLM to synthesize, not just copy."""
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
         state = _make_state()
         await generate_onboarding_package(state)
 
-        doc_user_prompt = mock_llm.call_args_list[1][0][1]
+        doc_user_prompt = self.mock_llm.call_args_list[1][0][1]
         self.assertIn("remix", doc_user_prompt.lower())
 
 
 # ==================================================================
 # 3. MAIN NODE — OUTPUT & PERSISTENCE
 # ==================================================================
-class TestGeneratePackageOutput(unittest.IsolatedAsyncioTestCase):
+class TestGeneratePackageOutput(_GeneratePackageNodeTest):
     """Verify the node produces correct output and persists correctly."""
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_returns_onboarding_package(self, mock_llm, mock_storage_cls):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
+    async def test_returns_onboarding_package(self):
         state = _make_state()
         result = await generate_onboarding_package(state)
 
@@ -314,21 +288,15 @@ class TestGeneratePackageOutput(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(pkg.risks_and_gotchas), 2)
         self.assertEqual(len(pkg.knowledge_entries), 2)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_persists_json_and_markdown(self, mock_llm, mock_storage_cls):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-        mock_store = mock_storage_cls.return_value
+    async def test_persists_json_and_markdown(self):
+        mock_store = self.mock_storage_cls.return_value
 
         state = _make_state()
         await generate_onboarding_package(state)
 
         # Should save JSON
         json_calls = [
-            c for c in mock_store.save_json.call_args_list
+            c for c in mock_store.save_json_async.call_args_list
             if "package.json" in c[0][0]
         ]
         self.assertEqual(len(json_calls), 1)
@@ -336,52 +304,32 @@ class TestGeneratePackageOutput(unittest.IsolatedAsyncioTestCase):
 
         # Should save markdown
         md_calls = [
-            c for c in mock_store.save_text.call_args_list
+            c for c in mock_store.save_text_async.call_args_list
             if "onboarding_docs.md" in c[0][0]
         ]
         self.assertEqual(len(md_calls), 1)
         self.assertEqual(md_calls[0][0][0], "onboarding_package/onboarding_docs.md")
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_markdown_contains_all_sections(self, mock_llm, mock_storage_cls):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-        mock_store = mock_storage_cls.return_value
+    async def test_markdown_contains_all_sections(self):
+        mock_store = self.mock_storage_cls.return_value
 
         state = _make_state()
         await generate_onboarding_package(state)
 
-        md_text = mock_store.save_text.call_args[0][1]
+        md_text = mock_store.save_text_async.call_args[0][1]
         self.assertIn("# Onboarding Document", md_text)
         self.assertIn("## Abstract", md_text)
         self.assertIn("## FAQ", md_text)
         self.assertIn("## Risks & Gotchas", md_text)
         self.assertIn("## Knowledge Entries", md_text)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_makes_exactly_two_llm_calls(self, mock_llm, mock_storage_cls):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
-
+    async def test_makes_exactly_two_llm_calls(self):
         state = _make_state()
         await generate_onboarding_package(state)
 
-        self.assertEqual(mock_llm.await_count, 2)
-
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_status_fields_in_result(self, mock_llm, mock_storage_cls):
-        mock_llm.side_effect = [
-            _mock_knowledge_entries_response(),
-            _mock_onboarding_doc_response(),
-        ]
+        self.assertEqual(self.mock_llm.await_count, 2)
 
+    async def test_status_fields_in_result(self):
         state = _make_state()
         result = await generate_onboarding_package(state)
 
@@ -392,34 +340,27 @@ class TestGeneratePackageOutput(unittest.IsolatedAsyncioTestCase):
 # ==================================================================
 # 4. EDGE CASES
 # ==================================================================
-class TestGeneratePackageEdgeCases(unittest.IsolatedAsyncioTestCase):
+class TestGeneratePackageEdgeCases(_GeneratePackageNodeTest):
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_empty_interview_summary(self, mock_llm, mock_storage_cls):
+    async def test_empty_interview_summary(self):
         """Node should work even if interview_summary is empty."""
-        mock_llm.side_effect = [
-            {"knowledge_entries": []},
-            _mock_onboarding_doc_response(),
-        ]
+        self.mock_llm.side_effect = [_mock_onboarding_doc_response()]
 
         state = _make_state(interview_summary="", facts=[], backlog=[])
         result = await generate_onboarding_package(state)
 
         pkg = result["onboarding_package"]
         self.assertIsInstance(pkg, OnboardingPackage)
-        # The doc prompt should still be sent (with fallback text)
-        doc_prompt = mock_llm.call_args_list[1][0][1]
+        self.assertEqual(pkg.knowledge_entries, [])
+        # Only the doc prompt is sent (with fallback text) — no interview
+        # output means the knowledge-entry call is skipped
+        self.assertEqual(self.mock_llm.await_count, 1)
+        doc_prompt = self.mock_llm.call_args_list[0][0][1]
         self.assertIn("no interview conducted", doc_prompt)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_missing_interview_summary_key(self, mock_llm, mock_storage_cls):
+    async def test_missing_interview_summary_key(self):
         """Node should handle state where interview_summary is not set at all."""
-        mock_llm.side_effect = [
-            {"knowledge_entries": []},
-            _mock_onboarding_doc_response(),
-        ]
+        self.mock_llm.side_effect = [_mock_onboarding_doc_response()]
 
         state = {
             "session_id": "test-pkg",
@@ -432,12 +373,11 @@ class TestGeneratePackageEdgeCases(unittest.IsolatedAsyncioTestCase):
         result = await generate_onboarding_package(state)
 
         self.assertIsInstance(result["onboarding_package"], OnboardingPackage)
+        self.assertEqual(self.mock_llm.await_count, 1)
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_empty_corpus(self, mock_llm, mock_storage_cls):
+    async def test_empty_corpus(self):
         """Node should work with empty corpus (e.g., no files parsed)."""
-        mock_llm.side_effect = [
+        self.mock_llm.side_effect = [
             {"knowledge_entries": []},
             {
                 "abstract": "Empty project",
@@ -453,23 +393,27 @@ class TestGeneratePackageEdgeCases(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(result["onboarding_package"].abstract, "Empty project")
 
-    @patch("backend.nodes.generate_package.SessionStorage")
-    @patch("backend.nodes.generate_package.call_llm_json", new_callable=AsyncMock)
-    async def test_knowledge_entries_passed_to_doc_call(
-        self, mock_llm, mock_storage_cls
-    ):
-        """Knowledge entries from call 1 should be included in call 2's prompt."""
+    async def test_knowledge_entries_passed_to_doc_call(self):
+        """Knowledge entries from call 1 feed call 2 and end up in the package."""
         ke_response = _mock_knowledge_entries_response()
-        mock_llm.side_effect = [ke_response, _mock_onboarding_doc_response()]
+        self.mock_llm.side_effect = [ke_response, _mock_onboarding_doc_response()]
+        mock_store = self.mock_storage_cls.return_value
 
         state = _make_state()
-        await generate_onboarding_package(state)
+        result = await generate_onboarding_package(state)
 
-        doc_prompt = mock_llm.call_args_list[1][0][1]
-        # The knowledge entries should be serialized in the prompt
+        # The knowledge entries should be serialized in the doc prompt
+        doc_prompt = self.mock_llm.call_args_list[1][0][1]
+        self.assertIn("## Knowledge Entries", doc_prompt)
         self.assertIn("Rate selection method", doc_prompt)
         self.assertIn("Q4 manual override", doc_prompt)
 
+        pkg = result["onboarding_package"]
+        self.assertEqual(pkg.knowledge_entries, ke_response["knowledge_entries"])
+        md_text = mock_store.save_text_async.call_args[0][1]
+        self.assertIn("Rate selection method", md_text)
+        self.assertIn("Q4 manual override", md_text)
+
 
 if __name__ == "__main__":
     unittest.main()
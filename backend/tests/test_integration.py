@@ -12,6 +12,8 @@ import tempfile
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from backend.models.artifacts import DeepDiveReport, StructuredFile
 from backend.models.questions import (
     Question,
@@ -19,24 +21,34 @@ from backend.models.questions import (
     QuestionPriority,
     QuestionStatus,
 )
-from backend.models.state import (
-    FileDeepDiveOutput,
-    FileDeepDiveState,
-    OffboardingState,
-    OnboardingState,
-)
-
+from backend.models.state import OffboardingState
 
 # ------------------------------------------------------------------
 # Fixtures
 # ------------------------------------------------------------------
+# Prototypes are validated once; helpers hand out copies with only the
+# varying fields replaced.
+_PROTOTYPE_FILE = StructuredFile(
+    file_id="revenue_model",
+    file_name="revenue_model.xlsx",
+    file_type="xlsx",
+    parsed_content={"data": "test content"},
+)
+
+_PROTOTYPE_QUESTION = Question(
+    question_id="q1",
+    question_text="Test question q1",
+    source_file_id="revenue_model",
+    status=QuestionStatus.OPEN,
+)
+
+
 def _make_file(file_id="revenue_model", file_type="xlsx") -> StructuredFile:
-    return StructuredFile(
-        file_id=file_id,
-        file_name=f"{file_id}.{file_type}",
-        file_type=file_type,
-        parsed_content={"data": "test content"},
-    )
+    return _PROTOTYPE_FILE.model_copy(update={
+        "file_id": file_id,
+        "file_name": f"{file_id}.{file_type}",
+        "file_type": file_type,
+    })
 
 
 def _make_report(file_id="revenue_model", pass_number=1) -> DeepDiveReport:
@@ -53,14 +65,12 @@ def _make_report(file_id="revenue_model", pass_number=1) -> DeepDiveReport:
 
 
 def _make_question(qid="q1", origin=QuestionOrigin.PER_FILE, priority=QuestionPriority.P1) -> Question:
-    return Question(
-        question_id=qid,
-        question_text=f"Test question {qid}",
-        origin=origin,
-        source_file_id="revenue_model",
-        status=QuestionStatus.OPEN,
-        priority=priority,
-    )
+    return _PROTOTYPE_QUESTION.model_copy(update={
+        "question_id": qid,
+        "question_text": f"Test question {qid}",
+        "origin": origin,
+        "priority": priority,
+    })
 
 
 # ==================================================================
@@ -110,6 +120,32 @@ class TestGraphCompilation(unittest.TestCase):
             f"Missing nodes: {expected - node_names}",
         )
 
+    def test_graphs_cap_deep_dive_concurrency(self):
+        from backend.config import settings
+        from backend.graphs.offboarding_graph import (
+            build_deep_dive_only_graph,
+            build_offboarding_graph,
+        )
+        for graph in (build_offboarding_graph(), build_deep_dive_only_graph()):
+            self.assertEqual(
+                graph.config["max_concurrency"],
+                settings.MAX_CONCURRENT_DEEP_DIVES,
+            )
+
+    def test_graph_singletons_are_prebuilt(self):
+        from backend.graphs.offboarding_graph import (
+            DEEP_DIVE_ONLY_GRAPH,
+            OFFBOARDING_GRAPH,
+            build_offboarding_graph,
+        )
+        from backend.graphs.onboarding_graph import ONBOARDING_GRAPH
+        from backend.routes import offboarding
+
+        self.assertIsNot(build_offboarding_graph(), OFFBOARDING_GRAPH)
+        self.assertIsNotNone(ONBOARDING_GRAPH)
+        # The route shares the pre-built graph rather than rebuilding it
+        self.assertIs(offboarding.DEEP_DIVE_ONLY_GRAPH, DEEP_DIVE_ONLY_GRAPH)
+
     def test_deep_dive_only_graph_has_subset_of_nodes(self):
         from backend.graphs.offboarding_graph import build_deep_dive_only_graph
         graph = build_deep_dive_only_graph()
@@ -219,7 +255,7 @@ class TestConcatenateToGlobalSummarize(unittest.IsolatedAsyncioTestCase):
 class TestGlobalSummarizeToReconcile(unittest.IsolatedAsyncioTestCase):
     """Verify global questions feed into reconciliation correctly."""
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
+    @patch("backend.nodes.reconcile_questions.SessionStorage", autospec=True)
     @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
     async def test_reconcile_handles_mixed_origins(self, mock_llm, mock_storage_cls):
         from backend.nodes.reconcile_questions import reconcile_questions
@@ -342,60 +378,37 @@ class TestFullPipelineStateCompatibility(unittest.TestCase):
     """Verify that the output of each node matches the expected input
     of the next node in the pipeline."""
 
-    def test_parse_output_keys_feed_deep_dive(self):
-        """parse_files should produce structured_files for deep dive fan-out."""
-        # Simulated parse_files output
-        output = {
-            "structured_files": [_make_file()],
-            "status": "parsed",
-            "current_step": "parse_files",
-        }
-        # deep_dive fan-out reads structured_files
-        self.assertIn("structured_files", output)
-        self.assertIsInstance(output["structured_files"], list)
-
-    def test_deep_dive_output_feeds_concatenate(self):
-        """deep_dive should produce deep_dive_reports for concatenation."""
-        # Simulated deep_dive output (after fan-in)
-        output = {
-            "deep_dive_reports": [_make_report()],
-        }
-        self.assertIn("deep_dive_reports", output)
-        self.assertIsInstance(output["deep_dive_reports"], list)
+    # (producing node, keys its output hands to the next node)
+    STATE_HANDOFFS = (
+        ("parse_files", ("structured_files",)),
+        ("file_deep_dive", ("deep_dive_reports",)),
+        ("concatenate_deep_dives", ("deep_dive_corpus", "question_backlog")),
+        ("global_summarize", ("global_summary", "question_backlog")),
+        ("interview_loop", (
+            "interview_transcript", "extracted_facts",
+            "interview_summary", "question_backlog",
+        )),
+    )
 
-    def test_concatenate_output_feeds_global_summarize(self):
-        """concatenate should produce deep_dive_corpus for global summarize."""
-        output = {
-            "deep_dive_corpus": "test corpus",
-            "question_backlog": [_make_question("q1")],
-        }
-        self.assertIn("deep_dive_corpus", output)
-        self.assertIn("question_backlog", output)
-
-    def test_global_summarize_output_feeds_reconcile(self):
-        """global_summarize should produce global_summary and updated backlog."""
-        output = {
-            "global_summary": "Global analysis",
-            "question_backlog": [_make_question("q1"), _make_question("q2")],
-        }
-        self.assertIn("global_summary", output)
-        self.assertIn("question_backlog", output)
+    @classmethod
+    def setUpClass(cls):
+        from backend.models.state import FileDeepDiveOutput, OnboardingState
 
-    def test_interview_output_feeds_package_and_qa_context(self):
-        """interview should produce everything build_qa_context and generate_package need."""
-        output = {
-            "interview_transcript": [],
-            "extracted_facts": ["fact1"],
-            "interview_summary": "Summary of interview",
-            "question_backlog": [],
-        }
-        # build_qa_context needs deep_dive_corpus, interview_summary, extracted_facts
-        self.assertIn("interview_summary", output)
-        self.assertIn("extracted_facts", output)
+        cls.off_ann = OffboardingState.__annotations__
+        cls.fdd_ann = FileDeepDiveOutput.__annotations__
+        cls.on_ann = OnboardingState.__annotations__
+
+    def test_state_shapes(self):
+        """Every key a node hands to the next must be declared on OffboardingState."""
+        annotations = self.off_ann
+        for node, keys in self.STATE_HANDOFFS:
+            for key in keys:
+                with self.subTest(node=node, key=key):
+                    self.assertIn(key, annotations)
 
     def test_offboarding_state_has_all_required_fields(self):
         """OffboardingState TypedDict should declare every field the pipeline uses."""
-        annotations = OffboardingState.__annotations__
+        annotations = self.off_ann
         required_keys = [
             "session_id", "project_metadata", "structured_files",
             "deep_dive_reports", "deep_dive_corpus", "global_summary",
@@ -408,7 +421,7 @@ class TestFullPipelineStateCompatibility(unittest.TestCase):
 
     def test_file_deep_dive_output_only_has_fan_in_safe_keys(self):
         """FileDeepDiveOutput should only expose keys with reducers."""
-        annotations = FileDeepDiveOutput.__annotations__
+        annotations = self.fdd_ann
         self.assertIn("deep_dive_reports", annotations)
         # These should NOT be in output (would cause fan-in conflicts)
         self.assertNotIn("session_id", annotations)
@@ -417,7 +430,7 @@ class TestFullPipelineStateCompatibility(unittest.TestCase):
 
     def test_onboarding_state_has_qa_system_prompt(self):
         """OnboardingState should have qa_system_prompt (not retrieval_index)."""
-        annotations = OnboardingState.__annotations__
+        annotations = self.on_ann
         self.assertIn("qa_system_prompt", annotations)
         self.assertIn("knowledge_graph", annotations)
         self.assertNotIn("retrieval_index", annotations)
@@ -426,24 +439,22 @@ class TestFullPipelineStateCompatibility(unittest.TestCase):
 # ==================================================================
 # 8. ROUTE COMPILATION
 # ==================================================================
+@pytest.mark.slow_import
 class TestRouteImports(unittest.TestCase):
     """Verify all routes import without errors."""
 
-    def test_offboarding_route_imports(self):
-        from backend.routes.offboarding import router
-        self.assertIsNotNone(router)
-
-    def test_interview_route_imports(self):
-        from backend.routes.interview import router
-        self.assertIsNotNone(router)
-
-    def test_onboarding_route_imports(self):
-        from backend.routes.onboarding import router
-        self.assertIsNotNone(router)
+    ROUTES = (
+        "backend.routes.offboarding",
+        "backend.routes.interview",
+        "backend.routes.onboarding",
+        "backend.routes.session",
+    )
 
-    def test_session_route_imports(self):
-        from backend.routes.session import router
-        self.assertIsNotNone(router)
+    def test_all_routes_import(self):
+        import importlib
+        for path in self.ROUTES:
+            with self.subTest(path):
+                self.assertIsNotNone(importlib.import_module(path).router)
 
 
 # ==================================================================
@@ -454,7 +465,9 @@ class TestFastAPIApp(unittest.TestCase):
 
     def test_app_has_all_route_prefixes(self):
         from backend.main import app
-        route_paths = [r.path for r in app.routes]
+        # Read paths from the OpenAPI schema: newer FastAPI wraps included
+        # routers in objects without a .path, so app.routes can't be listed
+        route_paths = list(app.openapi()["paths"])
         # Check for key endpoints
         expected_prefixes = [
             "/api/offboarding",
@@ -483,9 +496,11 @@ class TestNoDeadImports(unittest.TestCase):
 
     def test_onboarding_graph_does_not_import_embeddings(self):
         """onboarding_graph.py should not reference RetrievalService."""
-        import inspect
-        from backend.graphs import onboarding_graph
-        source = inspect.getsource(onboarding_graph)
+        # Read the file rather than importing it — no graph build needed
+        from pathlib import Path
+        source = (
+            Path(__file__).resolve().parent.parent / "graphs" / "onboarding_graph.py"
+        ).read_text(encoding="utf-8")
         self.assertNotIn("RetrievalService", source)
         self.assertNotIn("embeddings", source)
 
@@ -0,0 +1,88 @@
+"""Tests for data_delivery/kg_stream.py — the streaming KG item scanner.
+
+data_delivery is a script directory, not a package, so the module is
+loaded from its file path.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+_KG_STREAM = Path(__file__).resolve().parents[2] / "data_delivery" / "kg_stream.py"
+
+
+@pytest.fixture(scope="module")
+def kg_stream():
+    spec = importlib.util.spec_from_file_location("kg_stream", _KG_STREAM)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _evidence(quote: str) -> list[dict]:
+    return [{"source_type": "file", "source_id": "f1", "path": "a.py", "quote": quote}]
+
+
+# Quotes carry the characters the scanner keys on: brackets, braces, commas,
+# escaped quotes and a fake section header
+KG = {
+    "nodes": [
+        {
+            "id": f"n{i}", "type": "Module", "name": f"node {i}",
+            "evidence": _evidence(quote),
+        }
+        for i, quote in enumerate([
+            "plain",
+            'has ] and } and , inside',
+            'escaped \\" quote and "edges": [ text',
+            "unicode — ü ✓",
+            "",
+        ])
+    ],
+    "edges": [
+        {
+            "source": f"n{i}", "type": "DEPENDS_ON", "target": f"n{i + 1}",
+            "confidence": 0.5 + i / 10, "evidence": _evidence(f'edge {i} ["nodes": [')
+        }
+        for i in range(4)
+    ],
+}
+
+EXPECTED = [("nodes", n) for n in KG["nodes"]] + [("edges", e) for e in KG["edges"]]
+
+
+def _scan(kg_stream, pieces: list[str]) -> list[tuple[str, dict]]:
+    scanner = kg_stream.KGItemScanner()
+    items = []
+    for piece in pieces:
+        items.extend(scanner.feed(piece))
+    return items
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_whole_document(kg_stream, indent):
+    text = json.dumps(KG, indent=indent, ensure_ascii=False)
+    assert _scan(kg_stream, [text]) == EXPECTED
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_splits_yield_every_item_once(kg_stream, seed):
+    rng = random.Random(seed)
+    text = json.dumps(KG, indent=rng.choice([None, 2]), ensure_ascii=False)
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 60)))
+    pieces = [text[a:b] for a, b in zip([0, *cuts], [*cuts, len(text)])]
+
+    assert _scan(kg_stream, pieces) == EXPECTED
+
+
+def test_one_character_at_a_time(kg_stream):
+    assert _scan(kg_stream, list(json.dumps(KG))) == EXPECTED
+
+
+def test_empty_sections(kg_stream):
+    assert _scan(kg_stream, ['{"nodes": [', "], ", '"edges": []}']) == []
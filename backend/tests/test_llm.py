@@ -0,0 +1,90 @@
+"""Tests for services/llm.py request limiting and coalescing.
+
+No API key needed — the OpenAI client is replaced with a probe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from backend.services import llm
+
+
+def _probe_client(tracker: dict[str, int]):
+    """Fake client whose create() records how many calls overlap."""
+
+    async def create(**kwargs):
+        tracker["now"] += 1
+        tracker["peak"] = max(tracker["peak"], tracker["now"])
+        await asyncio.sleep(0)
+        tracker["now"] -= 1
+        message = SimpleNamespace(content='{"ok": true}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    completions = SimpleNamespace(create=create)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+async def test_concurrent_calls_are_bounded(monkeypatch):
+    tracker = {"now": 0, "peak": 0}
+    monkeypatch.setattr(llm, "_get_client", lambda: _probe_client(tracker))
+    monkeypatch.setattr("backend.config.settings.LLM_MAX_INFLIGHT", 4)
+
+    results = await asyncio.gather(
+        *(llm.call_llm_json("sys", f"user {i}") for i in range(50))
+    )
+
+    assert results == [{"ok": True}] * 50
+    assert tracker["peak"] == 4
+
+
+async def test_identical_inflight_requests_share_one_call(monkeypatch):
+    calls = []
+
+    async def fake_request(request):
+        calls.append(request)
+        await asyncio.sleep(0)
+        return {"items": [1]}
+
+    monkeypatch.setattr(llm, "_request_json", fake_request)
+
+    a, b, c = await asyncio.gather(
+        llm.call_llm_json("sys", "same"),
+        llm.call_llm_json("sys", "same"),
+        llm.call_llm_json("sys", "different"),
+    )
+
+    assert len(calls) == 2
+    assert a == b == c == {"items": [1]}
+    a["items"].append(2)
+    assert b == {"items": [1]}
+    assert llm._pending == {}
+
+
+async def test_waiters_reissue_when_owner_is_cancelled(monkeypatch):
+    calls = []
+    started = asyncio.Event()
+
+    async def fake_request(request):
+        calls.append(request)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.Event().wait()  # owner hangs until cancelled
+        await asyncio.sleep(0)
+        return {"items": [len(calls)]}
+
+    monkeypatch.setattr(llm, "_request_json", fake_request)
+
+    owner = asyncio.create_task(llm.call_llm_json("sys", "same"))
+    await started.wait()
+    waiters = [asyncio.create_task(llm.call_llm_json("sys", "same")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    results = await asyncio.gather(*waiters)
+
+    assert owner.cancelled()
+    assert results == [{"items": [2]}, {"items": [2]}]
+    assert len(calls) == 2
+    assert llm._pending == {}
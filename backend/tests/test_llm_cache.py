@@ -0,0 +1,86 @@
+"""Tests for services/llm_cache.py and its use in call_llm_json.
+
+No API key needed — the network request is patched out.
+"""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import AsyncMock, patch
+
+from backend.services.llm_cache import LLMCache, cache_key
+
+MESSAGES = [
+    {"role": "system", "content": "Return JSON"},
+    {"role": "user", "content": "hello"},
+]
+
+
+def test_cache_key_is_stable_and_request_specific():
+    k1 = cache_key("m", MESSAGES, temperature=0.2, max_tokens=100)
+    k2 = cache_key("m", list(MESSAGES), temperature=0.2, max_tokens=100)
+    assert k1 == k2
+    assert k1 != cache_key("m", MESSAGES, temperature=0.0, max_tokens=100)
+    assert k1 != cache_key("other", MESSAGES, temperature=0.2, max_tokens=100)
+
+
+def test_roundtrip_survives_new_instance(tmp_path):
+    LLMCache(tmp_path).set("abc", {"reconciled": []})
+    assert LLMCache(tmp_path).get("abc") == {"reconciled": []}
+    assert LLMCache(tmp_path).get("missing") is None
+
+
+def test_hits_are_copies(tmp_path):
+    cache = LLMCache(tmp_path)
+    cache.set("abc", {"items": [1]})
+    cache.get("abc")["items"].append(2)
+    assert cache.get("abc") == {"items": [1]}
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = LLMCache(tmp_path, max_memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"k": key})
+    assert list(cache._memory) == ["b", "c"]
+    # Evicted entries are still served from disk
+    assert cache.get("a") == {"k": "a"}
+
+
+async def test_call_llm_json_replays_cached_response(tmp_path, monkeypatch):
+    from backend.services import llm, llm_cache
+
+    monkeypatch.setattr("backend.config.settings.LLM_CACHE", True)
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(tmp_path))
+
+    with patch.object(llm, "_request_json", new_callable=AsyncMock) as mock_req:
+        mock_req.return_value = {"answer": 42}
+        first = await llm.call_llm_json("sys", "user")
+        second = await llm.call_llm_json("sys", "user")
+
+    assert first == second == {"answer": 42}
+    mock_req.assert_awaited_once()
+
+
+async def test_call_llm_json_keeps_cache_io_off_the_event_loop(tmp_path, monkeypatch):
+    from backend.services import llm, llm_cache
+
+    threads = []
+
+    class RecordingCache(LLMCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value):
+            threads.append(threading.get_ident())
+            super().set(key, value)
+
+    monkeypatch.setattr("backend.config.settings.LLM_CACHE", True)
+    monkeypatch.setattr(llm_cache, "_cache", RecordingCache(tmp_path))
+
+    with patch.object(llm, "_request_json", new_callable=AsyncMock) as mock_req:
+        mock_req.return_value = {"answer": 42}
+        await llm.call_llm_json("sys", "user")
+
+    assert len(threads) == 2  # one miss, one store
+    assert threading.get_ident() not in threads
@@ -7,29 +7,42 @@ the node as a whole through mocked LLM calls, covering:
 3. Priority reassignment (keep action with new priority)
 4. Cap enforcement (deprioritize excess)
 5. Empty backlog handling
-6. LLM response edge cases (missing questions, unknown actions)
+6. LLM response edge cases (missing questions, malformed decisions)
 
-All LLM calls are mocked — no API key needed.
+All LLM calls are mocked — no API key needed.  Each test class shares one
+event loop and one set of patches (pytest-asyncio loop_scope="class").
 """
 
 from __future__ import annotations
 
-import unittest
+import re
+from collections import defaultdict
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
-from backend.config import settings
+import pytest
+
 from backend.models.questions import (
     Question,
     QuestionOrigin,
     QuestionPriority,
     QuestionStatus,
 )
-from backend.nodes.reconcile_questions import reconcile_questions
-
 
 # ------------------------------------------------------------------
 # Fixtures
 # ------------------------------------------------------------------
+# Validated once; _make_q hands out copies with the requested fields.
+_PROTOTYPE_QUESTION = Question(
+    question_id="q1",
+    question_text="Why was this value chosen?",
+    origin=QuestionOrigin.PER_FILE,
+    source_file_id="test_file",
+    priority=QuestionPriority.P1,
+    status=QuestionStatus.OPEN,
+)
+
+
 def _make_q(
     qid="q1",
     text="Why was this value chosen?",
@@ -37,14 +50,24 @@ def _make_q(
     priority=QuestionPriority.P1,
     status=QuestionStatus.OPEN,
 ) -> Question:
-    return Question(
-        question_id=qid,
-        question_text=text,
-        origin=origin,
-        source_file_id="test_file",
-        priority=priority,
-        status=status,
-    )
+    return _PROTOTYPE_QUESTION.model_copy(update={
+        "question_id": qid,
+        "question_text": text,
+        "origin": origin,
+        "priority": priority,
+        "status": status,
+    })
+
+
+def _by_status(backlog: list[Question]) -> defaultdict[QuestionStatus, list[Question]]:
+    """Group a result backlog by status in one pass."""
+    grouped: defaultdict[QuestionStatus, list[Question]] = defaultdict(list)
+    for q in backlog:
+        grouped[q.status].append(q)
+    return grouped
+
+
+_LONG_CORPUS = "x" * 20_000  # well past the node's 6000-char prompt budget
 
 
 def _make_state(questions: list[Question]) -> dict:
@@ -56,271 +79,305 @@ def _make_state(questions: list[Question]) -> dict:
     }
 
 
+def _keep(qid: str, priority: str = "P1") -> dict:
+    return {"question_id": qid, "action": "keep", "priority": priority}
+
+
+def _reconciled(*entries: dict) -> dict:
+    """LLM response payload for reconcile_questions."""
+    return {"reconciled": list(entries)}
+
+
+def _assert_saved_json(mock_store, path):
+    mock_store.save_json_async.assert_awaited_once()
+    assert mock_store.save_json_async.call_args[0][0] == path
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="class")
+
+
+@pytest.fixture(scope="class")
+def _patched():
+    """Patch storage + LLM once per class instead of per-test decorators."""
+    # spec'd: calls are checked against call_llm_json's signature and
+    # no child mocks are conjured for stray attribute access
+    from backend.services.llm import call_llm_json
+
+    with patch(
+        "backend.nodes.reconcile_questions.SessionStorage", autospec=True,
+    ) as storage_cls, patch(
+        "backend.nodes.reconcile_questions.call_llm_json",
+        new=AsyncMock(spec=call_llm_json),
+    ) as llm:
+        yield SimpleNamespace(storage_cls=storage_cls, llm=llm)
+
+
+@pytest.fixture
+def mock_llm(_patched):
+    _patched.llm.reset_mock(return_value=True, side_effect=True)
+    return _patched.llm
+
+
+@pytest.fixture
+def mock_store(_patched):
+    _patched.storage_cls.reset_mock()
+    return _patched.storage_cls.return_value
+
+
+@pytest.fixture
+def reconcile_questions(_patched):
+    # Imported here, not at module scope, so collecting this file
+    # doesn't pull in the node's LLM/storage dependency tree.
+    from backend.nodes.reconcile_questions import reconcile_questions
+
+    return reconcile_questions
+
+
 # ==================================================================
 # 1. EMPTY BACKLOG
 # ==================================================================
-class TestEmptyBacklog(unittest.IsolatedAsyncioTestCase):
+class TestEmptyBacklog:
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    async def test_empty_backlog_returns_empty(self, mock_storage_cls):
+    async def test_empty_backlog_returns_empty(self, reconcile_questions, mock_store):
         state = _make_state([])
         result = await reconcile_questions(state)
 
-        self.assertEqual(result["question_backlog"], [])
-        self.assertEqual(result["status"], "questions_ready")
+        assert result["question_backlog"] == []
+        assert result["status"] == "questions_ready"
         # Should persist empty backlog
-        mock_storage_cls.return_value.save_json.assert_called_once()
-
-
-# ==================================================================
-# 2. KEEP (PRIORITY REASSIGNMENT)
-# ==================================================================
-class TestKeepAction(unittest.IsolatedAsyncioTestCase):
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_keep_updates_priority(self, mock_llm, mock_storage_cls):
-        q = _make_q("q1", priority=QuestionPriority.P2)
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P0"},
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q]))
-
-        backlog = result["question_backlog"]
-        self.assertEqual(len(backlog), 1)
-        self.assertEqual(backlog[0].priority, QuestionPriority.P0)
-        self.assertEqual(backlog[0].status, QuestionStatus.OPEN)
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_keep_with_invalid_priority_keeps_original(self, mock_llm, mock_storage_cls):
-        q = _make_q("q1", priority=QuestionPriority.P1)
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "INVALID"},
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q]))
-        self.assertEqual(result["question_backlog"][0].priority, QuestionPriority.P1)
+        _assert_saved_json(mock_store, "question_backlog.json")
 
 
 # ==================================================================
-# 3. MERGE (DEDUP)
+# 2. KEEP / MERGE / ANSWER
 # ==================================================================
-class TestMergeAction(unittest.IsolatedAsyncioTestCase):
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_merge_marks_status(self, mock_llm, mock_storage_cls):
-        q1 = _make_q("q1", text="What is the rate?")
-        q2 = _make_q("q2", text="How was the rate chosen?")
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P1"},
-                {"question_id": "q2", "action": "merge", "merged_into": "q1"},
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q1, q2]))
-
-        backlog = result["question_backlog"]
-        self.assertEqual(len(backlog), 2)
+_OPEN = QuestionStatus.OPEN
+_P0, _P1, _P2 = QuestionPriority.P0, QuestionPriority.P1, QuestionPriority.P2
+
+# (name, backlog, LLM response, {question_id: expected attributes})
+_ACTION_SCENARIOS = [
+    (
+        "keep updates priority",
+        lambda: [_make_q("q1", priority=_P2)],
+        [_keep("q1", "P0")],
+        {"q1": {"status": _OPEN, "priority": _P0}},
+    ),
+    (
+        "keep with invalid priority keeps original",
+        lambda: [_make_q("q1", priority=_P1)],
+        [_keep("q1", "INVALID")],
+        {"q1": {"priority": _P1}},
+    ),
+    (
+        "merge marks status",
+        lambda: [
+            _make_q("q1", text="What is the rate?"),
+            _make_q("q2", text="How was the rate chosen?"),
+        ],
+        [
+            _keep("q1"),
+            {"question_id": "q2", "action": "merge", "merged_into": "q1"},
+        ],
+        {"q1": {"status": _OPEN}, "q2": {"status": QuestionStatus.MERGED}},
+    ),
+    (
+        "answer sets status and answer text",
+        lambda: [_make_q("q1", text="What rate is used?")],
+        [{
+            "question_id": "q1",
+            "action": "answer",
+            "answer": "The 5-year historical average of 3.5%.",
+        }],
+        {"q1": {
+            "status": QuestionStatus.ANSWERED_BY_FILES,
+            "answer": "The 5-year historical average of 3.5%.",
+        }},
+    ),
+    (
+        # If LLM omits a question, it should stay as-is
+        "missing question in LLM response",
+        lambda: [_make_q("q1", priority=_P1), _make_q("q2", priority=_P2)],
+        [_keep("q1", "P0")],
+        {"q2": {"status": _OPEN, "priority": _P2}},
+    ),
+    (
+        "unknown action treated as keep",
+        lambda: [_make_q("q1", priority=_P2)],
+        [{"question_id": "q1", "action": "unknown_action", "priority": "P0"}],
+        {"q1": {"status": _OPEN, "priority": _P0}},
+    ),
+    (
+        "missing action treated as keep",
+        lambda: [_make_q("q1", priority=_P2)],
+        [{"question_id": "q1", "priority": "P1"}],
+        {"q1": {"status": _OPEN, "priority": _P1}},
+    ),
+    (
+        "merge with invalid priority still merges",
+        lambda: [_make_q("q1"), _make_q("q2")],
+        [
+            _keep("q1"),
+            {
+                "question_id": "q2", "action": "merge",
+                "merged_into": "q1", "priority": "high",
+            },
+        ],
+        {"q2": {"status": QuestionStatus.MERGED}},
+    ),
+    (
+        "decision without question_id is ignored",
+        lambda: [_make_q("q1")],
+        [{"action": "merge", "merged_into": "q2"}],
+        {"q1": {"status": _OPEN}},
+    ),
+    (
+        "mixed actions",
+        lambda: [
+            _make_q("q1", text="What rate?"),
+            _make_q("q2", text="How was rate chosen?"),
+            _make_q("q3", text="Who is the CFO?"),
+        ],
+        [
+            _keep("q1", "P0"),
+            {"question_id": "q2", "action": "merge", "merged_into": "q1"},
+            {"question_id": "q3", "action": "answer", "answer": "Jane Smith"},
+        ],
+        {
+            "q1": {"status": _OPEN},
+            "q2": {"status": QuestionStatus.MERGED},
+            "q3": {"status": QuestionStatus.ANSWERED_BY_FILES},
+        },
+    ),
+]
+
+
+class TestReconcileActions:
+
+    @pytest.mark.parametrize(
+        "build, response, expected",
+        [pytest.param(build, response, expected, id=name)
+         for name, build, response, expected in _ACTION_SCENARIOS],
+    )
+    async def test_action(
+        self, reconcile_questions, mock_llm, build, response, expected
+    ):
+        questions = build()
+        mock_llm.return_value = _reconciled(*response)
 
-        merged = [q for q in backlog if q.question_id == "q2"][0]
-        self.assertEqual(merged.status, QuestionStatus.MERGED)
+        result = await reconcile_questions(_make_state(questions))
 
-        kept = [q for q in backlog if q.question_id == "q1"][0]
-        self.assertEqual(kept.status, QuestionStatus.OPEN)
+        backlog = {q.question_id: q for q in result["question_backlog"]}
+        assert len(backlog) == len(questions)
+        for qid, attrs in expected.items():
+            for attr, value in attrs.items():
+                assert getattr(backlog[qid], attr) == value, f"{qid}.{attr}"
 
 
 # ==================================================================
-# 4. ANSWER (AUTO-RESOLVE)
+# 3. CAP ENFORCEMENT
 # ==================================================================
-class TestAnswerAction(unittest.IsolatedAsyncioTestCase):
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_answer_sets_status_and_answer_text(self, mock_llm, mock_storage_cls):
-        q = _make_q("q1", text="What rate is used?")
-        mock_llm.return_value = {
-            "reconciled": [
-                {
-                    "question_id": "q1",
-                    "action": "answer",
-                    "answer": "The 5-year historical average of 3.5%.",
-                },
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q]))
-
-        backlog = result["question_backlog"]
-        answered = backlog[0]
-        self.assertEqual(answered.status, QuestionStatus.ANSWERED_BY_FILES)
-        self.assertIn("3.5%", answered.answer)
+@pytest.fixture(scope="class")
+def cap():
+    """Cap tests need MAX_OPEN_QUESTIONS+ questions; build them once per class."""
+    from backend.config import settings
+
+    max_q = settings.MAX_OPEN_QUESTIONS
+    excess_qs = tuple(
+        _make_q(f"q{i}", priority=QuestionPriority.P2) for i in range(max_q + 5)
+    )
+    # Question and its "keep" decision are built together, then unzipped
+    counts = ((QuestionPriority.P0, 3), (QuestionPriority.P2, max_q + 3))
+    mixed = [
+        (
+            _make_q(qid, priority=priority),
+            _keep(qid, priority.value),
+        )
+        for priority, count in counts
+        for qid in (f"{priority.value.lower()}-{i}" for i in range(count))
+    ]
+    mixed_qs, mixed_reconciled = map(tuple, zip(*mixed))
+    return SimpleNamespace(
+        max_q=max_q,
+        excess_qs=excess_qs,
+        excess_response=_reconciled(*(_keep(q.question_id, "P2") for q in excess_qs)),
+        mixed_qs=mixed_qs,
+        mixed_response=_reconciled(*mixed_reconciled),
+    )
 
 
-# ==================================================================
-# 5. CAP ENFORCEMENT
-# ==================================================================
-class TestCapEnforcement(unittest.IsolatedAsyncioTestCase):
+class TestCapEnforcement:
+    """The node returns copies of changed questions, so the `cap`
+    prototypes are shared across tests as-is."""
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_excess_questions_deprioritized(self, mock_llm, mock_storage_cls):
+    async def test_excess_questions_deprioritized(
+        self, cap, reconcile_questions, mock_llm
+    ):
         """When LLM keeps too many, cap should deprioritize excess P2 first."""
-        max_q = settings.MAX_OPEN_QUESTIONS
-        # Create more questions than the cap
-        questions = [_make_q(f"q{i}", priority=QuestionPriority.P2) for i in range(max_q + 5)]
-
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": f"q{i}", "action": "keep", "priority": "P2"}
-                for i in range(max_q + 5)
-            ]
-        }
+        questions = list(cap.excess_qs)
+        mock_llm.return_value = cap.excess_response
 
         result = await reconcile_questions(_make_state(questions))
 
-        backlog = result["question_backlog"]
-        open_qs = [q for q in backlog if q.status == QuestionStatus.OPEN]
-        depri_qs = [q for q in backlog if q.status == QuestionStatus.DEPRIORITIZED]
+        by_status = _by_status(result["question_backlog"])
 
-        self.assertLessEqual(len(open_qs), max_q)
-        self.assertEqual(len(depri_qs), 5)
+        assert len(by_status[QuestionStatus.OPEN]) <= cap.max_q
+        assert len(by_status[QuestionStatus.DEPRIORITIZED]) == 5
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_cap_preserves_higher_priority(self, mock_llm, mock_storage_cls):
+    async def test_cap_preserves_higher_priority(
+        self, cap, reconcile_questions, mock_llm
+    ):
         """P0 questions should be kept over P2 when capping."""
-        max_q = settings.MAX_OPEN_QUESTIONS
-        # Create P0 questions + P2 questions totaling more than cap
-        p0_qs = [_make_q(f"p0-{i}", priority=QuestionPriority.P0) for i in range(3)]
-        p2_qs = [_make_q(f"p2-{i}", priority=QuestionPriority.P2) for i in range(max_q + 3)]
-        all_qs = p0_qs + p2_qs
-
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": q.question_id, "action": "keep", "priority": q.priority.value}
-                for q in all_qs
-            ]
-        }
+        all_qs = list(cap.mixed_qs)
+        mock_llm.return_value = cap.mixed_response
 
         result = await reconcile_questions(_make_state(all_qs))
 
-        open_qs = [q for q in result["question_backlog"] if q.status == QuestionStatus.OPEN]
+        open_qs = _by_status(result["question_backlog"])[QuestionStatus.OPEN]
         # All P0 should survive
         p0_open = [q for q in open_qs if q.priority == QuestionPriority.P0]
-        self.assertEqual(len(p0_open), 3)
+        assert len(p0_open) == 3
+
+    async def test_input_questions_not_mutated(
+        self, cap, reconcile_questions, mock_llm
+    ):
+        mock_llm.return_value = cap.excess_response
+
+        await reconcile_questions(_make_state(list(cap.excess_qs)))
+
+        assert all(q.status == QuestionStatus.OPEN for q in cap.excess_qs)
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_no_cap_when_under_limit(self, mock_llm, mock_storage_cls):
+    async def test_no_cap_when_under_limit(self, reconcile_questions, mock_llm):
         q1 = _make_q("q1")
         q2 = _make_q("q2")
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P1"},
-                {"question_id": "q2", "action": "keep", "priority": "P1"},
-            ]
-        }
+        mock_llm.return_value = _reconciled(_keep("q1"), _keep("q2"))
 
         result = await reconcile_questions(_make_state([q1, q2]))
 
-        open_qs = [q for q in result["question_backlog"] if q.status == QuestionStatus.OPEN]
-        self.assertEqual(len(open_qs), 2)
+        open_qs = _by_status(result["question_backlog"])[QuestionStatus.OPEN]
+        assert len(open_qs) == 2
 
 
 # ==================================================================
-# 6. EDGE CASES
+# 4. EDGE CASES
 # ==================================================================
-class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_missing_question_in_llm_response(self, mock_llm, mock_storage_cls):
-        """If LLM omits a question, it should stay as-is."""
-        q1 = _make_q("q1", priority=QuestionPriority.P1)
-        q2 = _make_q("q2", priority=QuestionPriority.P2)
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P0"},
-                # q2 not mentioned
-            ]
-        }
+class TestEdgeCases:
 
-        result = await reconcile_questions(_make_state([q1, q2]))
-
-        backlog = result["question_backlog"]
-        q2_result = [q for q in backlog if q.question_id == "q2"][0]
-        # Should keep original priority since LLM didn't touch it
-        self.assertEqual(q2_result.priority, QuestionPriority.P2)
-        self.assertEqual(q2_result.status, QuestionStatus.OPEN)
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_unknown_action_treated_as_keep(self, mock_llm, mock_storage_cls):
+    async def test_persists_backlog_json(
+        self, reconcile_questions, mock_llm, mock_store
+    ):
         q = _make_q("q1")
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "unknown_action", "priority": "P1"},
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q]))
-        self.assertEqual(result["question_backlog"][0].status, QuestionStatus.OPEN)
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_mixed_actions(self, mock_llm, mock_storage_cls):
-        """Mix of keep, merge, and answer in one batch."""
-        q1 = _make_q("q1", text="What rate?")
-        q2 = _make_q("q2", text="How was rate chosen?")
-        q3 = _make_q("q3", text="Who is the CFO?")
-
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P0"},
-                {"question_id": "q2", "action": "merge", "merged_into": "q1"},
-                {"question_id": "q3", "action": "answer", "answer": "Jane Smith"},
-            ]
-        }
-
-        result = await reconcile_questions(_make_state([q1, q2, q3]))
-
-        backlog = result["question_backlog"]
-        statuses = {q.question_id: q.status for q in backlog}
-        self.assertEqual(statuses["q1"], QuestionStatus.OPEN)
-        self.assertEqual(statuses["q2"], QuestionStatus.MERGED)
-        self.assertEqual(statuses["q3"], QuestionStatus.ANSWERED_BY_FILES)
-
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_persists_backlog_json(self, mock_llm, mock_storage_cls):
-        mock_store = mock_storage_cls.return_value
-        q = _make_q("q1")
-        mock_llm.return_value = {
-            "reconciled": [
-                {"question_id": "q1", "action": "keep", "priority": "P1"},
-            ]
-        }
+        mock_llm.return_value = _reconciled(_keep("q1"))
 
         await reconcile_questions(_make_state([q]))
 
-        mock_store.save_json.assert_called_once()
-        path = mock_store.save_json.call_args[0][0]
-        self.assertEqual(path, "question_backlog.json")
+        _assert_saved_json(mock_store, "question_backlog.json")
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_prompt_includes_corpus_and_summary(self, mock_llm, mock_storage_cls):
+    async def test_prompt_includes_corpus_and_summary(
+        self, reconcile_questions, mock_llm
+    ):
         """Verify the LLM prompt contains the evidence corpus and global summary."""
         q = _make_q("q1")
-        mock_llm.return_value = {"reconciled": [{"question_id": "q1", "action": "keep", "priority": "P1"}]}
+        mock_llm.return_value = _reconciled(_keep("q1"))
 
         state = _make_state([q])
         state["deep_dive_corpus"] = "Special corpus content"
@@ -329,25 +386,39 @@ class TestEdgeCases(unittest.IsolatedAsyncioTestCase):
         await reconcile_questions(state)
 
         user_prompt = mock_llm.call_args[0][1]
-        self.assertIn("Special corpus content", user_prompt)
-        self.assertIn("Special global summary", user_prompt)
+        assert "Special corpus content" in user_prompt
+        assert "Special global summary" in user_prompt
 
-    @patch("backend.nodes.reconcile_questions.SessionStorage")
-    @patch("backend.nodes.reconcile_questions.call_llm_json", new_callable=AsyncMock)
-    async def test_prompt_truncates_long_corpus(self, mock_llm, mock_storage_cls):
+    async def test_prompt_truncates_long_corpus(self, reconcile_questions, mock_llm):
         q = _make_q("q1")
-        mock_llm.return_value = {"reconciled": [{"question_id": "q1", "action": "keep", "priority": "P1"}]}
+        mock_llm.return_value = _reconciled(_keep("q1"))
 
         state = _make_state([q])
-        state["deep_dive_corpus"] = "x" * 20_000
+        state["deep_dive_corpus"] = _LONG_CORPUS
 
         await reconcile_questions(state)
 
         user_prompt = mock_llm.call_args[0][1]
-        self.assertIn("[truncated]", user_prompt)
+        assert "[truncated]" in user_prompt
         # Should not exceed ~6000 chars for corpus portion
-        self.assertLess(len(user_prompt), 25_000)
+        assert len(user_prompt) < 25_000
+
+    async def test_whole_backlog_goes_out_in_one_call(
+        self, reconcile_questions, mock_llm
+    ):
+        """Duplicates can only be merged if they share a prompt, so no chunking."""
+        questions = [_make_q(f"q{i}") for i in range(40)]
+        mock_llm.return_value = _reconciled(
+            _keep("q0"),
+            {"question_id": "q39", "action": "merge", "merged_into": "q0"},
+        )
 
+        result = await reconcile_questions(_make_state(questions))
 
-if __name__ == "__main__":
-    unittest.main()
+        mock_llm.assert_awaited_once()
+        user_prompt = mock_llm.call_args[0][1]
+        assert re.findall(r"^- \[(q\d+)\]", user_prompt, re.MULTILINE) == [
+            q.question_id for q in questions
+        ]
+        backlog = {q.question_id: q for q in result["question_backlog"]}
+        assert backlog["q39"].status == QuestionStatus.MERGED
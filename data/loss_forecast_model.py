@@ -55,9 +55,11 @@ SEGMENT_LOSS_THRESHOLDS = {
 def load_historical_defaults(db_path: str = DB_PATH) -> pd.DataFrame:
     """Load historical default rates from portfolio_risk.db."""
     conn = sqlite3.connect(db_path)
-    df = pd.read_sql("SELECT * FROM historical_defaults ORDER BY quarter DESC", conn)
+    rows = conn.execute(
+        "SELECT quarter, default_rate FROM historical_defaults ORDER BY quarter DESC"
+    ).fetchall()
     conn.close()
-    return df
+    return pd.DataFrame(rows, columns=["quarter", "default_rate"])
 
 
 def compute_baseline_rate(
@@ -130,21 +132,18 @@ def generate_forecast(db_path: str = DB_PATH) -> pd.DataFrame:
     Output is saved to Q3_2024_forecast.xlsx after manual overlay review.
     """
     defaults_df = load_historical_defaults(db_path)
-    baseline = compute_baseline_rate(defaults_df)
-
-    results = []
-    for segment in SEGMENTS:
-        threshold = SEGMENT_LOSS_THRESHOLDS.get(segment)
-        results.append({
-            "segment": segment,
-            "baseline_rate": round(baseline, 4),
-            "macro_overlay": 0.0,        # Filled in manually by Alice
-            "final_rate": round(baseline, 4),  # Updated after overlay
-            "threshold": threshold,       # May be None — that's a problem
-            "rationale": "",              # Alice fills this in (but rarely does)
-        })
-
-    return pd.DataFrame(results)
+    baseline = round(compute_baseline_rate(defaults_df), 4)
+
+    n = len(SEGMENTS)
+    return pd.DataFrame({
+        "segment": SEGMENTS,
+        "baseline_rate": np.full(n, baseline),
+        "macro_overlay": np.zeros(n),        # Filled in manually by Alice
+        "final_rate": np.full(n, baseline),  # Updated after overlay
+        # May be None — that's a problem
+        "threshold": [SEGMENT_LOSS_THRESHOLDS.get(segment) for segment in SEGMENTS],
+        "rationale": [""] * n,               # Alice fills this in (but rarely does)
+    })
 
 
 if __name__ == "__main__":
@@ -1,23 +1,58 @@
-import json
-import networkx as nx
+import logging
+import sys
+
 import matplotlib.pyplot as plt
+import networkx as nx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def _intern(v):
+    return sys.intern(v) if isinstance(v, str) else v
 
-def build_nx_graph(kg_json_str: str) -> nx.MultiDiGraph:
-    kg = json.loads(kg_json_str)
+
+def _interned_props(item: dict) -> dict:
+    return {k: _intern(v) for k, v in item.get("properties", {}).items()}
+
+
+def build_nx_graph(kg: dict | str) -> nx.MultiDiGraph:
+    if isinstance(kg, str):
+        kg = orjson.loads(kg)
     G = nx.MultiDiGraph()
 
+    # Types and property values repeat across nodes/edges (small vocabulary);
+    # intern so they share one str
     for n in kg["nodes"]:
-        G.add_node(n["id"], label=n["type"], name=n["name"], **n.get("properties", {}))
+        G.add_node(
+            n["id"], label=sys.intern(n["type"]), name=n["name"], **_interned_props(n)
+        )
 
     for e in kg["edges"]:
-        G.add_edge(e["source"], e["target"], key=e["type"], label=e["type"], **e.get("properties", {}))
+        edge_type = sys.intern(e["type"])
+        G.add_edge(
+            e["source"], e["target"],
+            key=edge_type, label=edge_type, **_interned_props(e),
+        )
 
     return G
 
+def layout(G: nx.Graph) -> dict:
+    """Node positions from Graphviz sfdp (one C subprocess).
+
+    Falls back to spring_layout if pygraphviz is missing.
+    """
+    try:
+        return nx.nx_agraph.graphviz_layout(G, prog="sfdp")
+    except ImportError:
+        return nx.spring_layout(G, seed=0)
+
+
 if __name__ == "__main__":
-    with open("kg.json", "r") as f:
-        kg = json.load(f)
-    G = build_nx_graph(json.dumps(kg))
-    print(G)
-    nx.draw(G, with_labels=True)
-    plt.show()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    with open("kg.json", "rb") as f:
+        kg = orjson.loads(f.read())
+    G = build_nx_graph(kg)
+    logger.info("%s", G)
+    nx.draw(G, layout(G), with_labels=True, node_size=300)
+    plt.show()
@@ -1,13 +1,43 @@
+import asyncio
+import functools
+import hashlib
 import json
-from openai import OpenAI
+import logging
 import os
-import networkx as nx
+from time import perf_counter, time
+from types import MappingProxyType
+from typing import Callable
+
+import fastjsonschema
 import matplotlib.pyplot as plt
-from time import time
+import networkx as nx
+import numpy as np
+import orjson
+import tiktoken
+from kg_stream import KGItemScanner
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+client = AsyncOpenAI()
+
+# Content-addressed cache of extracted KGs; set KG_CACHE_DIR="" to disable.
+KG_CACHE_DIR = os.getenv("KG_CACHE_DIR", ".kg_cache")
+# Exact-match entries older than this are re-extracted; 0 keeps them forever.
+KG_CACHE_TTL_SECONDS = float(os.getenv("KG_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# SemanticKGCache is opt-in (KG_SEMANTIC_CACHE=1): a near-duplicate hit returns the KG
+# of a different input, which is stale if a single fact in the transcript changed.
+KG_SEMANTIC_CACHE = os.getenv("KG_SEMANTIC_CACHE", "0") == "1"
+# Cosine similarity that both the context and the interview must reach to reuse a KG.
+KG_SEMANTIC_THRESHOLD = float(os.getenv("KG_SEMANTIC_THRESHOLD", "0.97"))
 
-client = OpenAI()
+# Hard caps from the prompt, also enforced by the schema so the decoder stops there.
+MAX_NODES = 22
+MAX_EDGES = 35
 
-KG_WITH_EVIDENCE_SCHEMA = {
+# Single definition, read-only at the top level; the nested schema is passed to the
+# API as-is.
+KG_WITH_EVIDENCE_SCHEMA = MappingProxyType({
     "name": "onboarding_kg_with_evidence",
     "schema": {
         "type": "object",
@@ -15,6 +45,7 @@ KG_WITH_EVIDENCE_SCHEMA = {
         "properties": {
             "nodes": {
                 "type": "array",
+                "maxItems": MAX_NODES,
                 "items": {
                     "type": "object",
                     "additionalProperties": False,
@@ -43,10 +74,9 @@ KG_WITH_EVIDENCE_SCHEMA = {
                                     #     },
                                     #     "required": ["start", "end"]
                                     # },
-                                    # "snippet_hash": {"type": "string"},  # sha256 of the snippet text (your backend computes)
+                                    # snippet_hash: not generated, run.build_kg adds it
                                     "quote": {"type": "string"},         # short excerpt; keep short in prod UI
                                 },
-                                # "required": ["source_type", "source_id", "path", "snippet_hash", "quote"]
                                 "required": ["source_type", "source_id", "path", "quote"]
                             }
                         },
@@ -57,6 +87,7 @@ KG_WITH_EVIDENCE_SCHEMA = {
             },
             "edges": {
                 "type": "array",
+                "maxItems": MAX_EDGES,
                 "items": {
                     "type": "object",
                     "additionalProperties": False,
@@ -83,10 +114,8 @@ KG_WITH_EVIDENCE_SCHEMA = {
                                     #     },
                                     #     "required": ["start", "end"]
                                     # },
-                                    # "snippet_hash": {"type": "string"},
                                     "quote": {"type": "string"},
                                 },
-                                # "required": ["source_type", "source_id", "path", "snippet_hash", "quote"]
                                 "required": ["source_type", "source_id", "path", "quote"]
                             }
                         },
@@ -99,7 +128,10 @@ KG_WITH_EVIDENCE_SCHEMA = {
         "required": ["nodes", "edges"]
     },
     "strict": True
-}
+})
+
+# Local check of the structured output before it is cached or returned.
+validate_kg = fastjsonschema.compile(KG_WITH_EVIDENCE_SCHEMA["schema"])
 
 SYSTEM = """
 You are an expert knowledge retention engineer. Convert project knowledge into an onboarding knowledge graph.
@@ -134,7 +166,6 @@ Evidence rules (CRITICAL):
   - confidence in [0,1]
   - evidence: citations from inputs only
 - If evidence is weak, lower confidence and keep quote short (<= 140 chars).
-- snippet_hash must be "sha256:<to_fill>" (backend will replace).
 - path is file path when source_type=file, else "".
 
 Evidence prioritization rule (CRITICAL):
@@ -160,15 +191,31 @@ When generating evidence for a concept:
 """
 
 
-def extract_kg_with_evidence(client: OpenAI, project_context: str, interview_transcript: str) -> str:
-    user = f"""
-Inputs:
-(1) Project Context (from existing files):
-{project_context}
+# Everything but the input and output budget is fixed: build it (and its cache-key
+# hash) once at import.
+# Read-only at the top level; _request_params copies it into a fresh dict per request.
+_BASE_PARAMS = MappingProxyType({
+    "model": "gpt-5-mini",
+    "instructions": SYSTEM,
+    "reasoning": {"effort": "low"},
+    # Structured Outputs (JSON Schema + strict) :contentReference[oaicite:2]{index=2}
+    "text": {
+        "format": {
+            "type": "json_schema",
+            "name": KG_WITH_EVIDENCE_SCHEMA["name"],
+            "strict": True,
+            "schema": KG_WITH_EVIDENCE_SCHEMA["schema"],
+        }
+    },
+})
+_BASE_PARAMS_HASH = hashlib.sha256(
+    json.dumps(dict(_BASE_PARAMS), sort_keys=True).encode("utf-8")
+)
 
-(2) Interview Transcript:
-{interview_transcript}
 
+# Fixed task text goes ahead of the per-request inputs so instructions + task form a
+# stable prompt prefix the API can serve from its prompt cache.
+TASK = """
 Task:
 Build ONE compact onboarding knowledge graph for takeover.
 
@@ -186,28 +233,376 @@ Hard constraints:
 Return strictly valid JSON following the provided schema.
 """
 
-    start_time = time()
-    resp = client.responses.create(
-        model="gpt-5-mini",
-        instructions=SYSTEM,
-        reasoning={"effort": "low"},
-        input=user,
-        # Structured Outputs (JSON Schema + strict) :contentReference[oaicite:2]{index=2}
-        text={
-        "format": {
-            "type": "json_schema",
-            "name": KG_WITH_EVIDENCE_SCHEMA["name"],      
-            "strict": True,
-            "schema": KG_WITH_EVIDENCE_SCHEMA["schema"],
-        }
-    },
-    max_output_tokens=7000,
+
+def _request_params(project_context: str, interview_transcript: str) -> dict:
+    """Responses API parameters for one extraction.
+
+    Shared by the direct and Batch API paths.
+    """
+    user = f"""{TASK}
+Inputs:
+(1) Project Context (from existing files):
+{project_context}
+
+(2) Interview Transcript:
+{interview_transcript}
+"""
+
+    return {
+        **_BASE_PARAMS,
+        "input": user,
+        "max_output_tokens": _max_output_tokens(project_context, interview_transcript),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding | None:
+    """gpt-5 family tokenizer, loaded on first use; None if it can't be loaded.
+
+    tiktoken downloads the encoding file the first time, so this fails offline.
+    """
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(
+            "tiktoken encoding unavailable (%s); estimating tokens as chars / 4", e
+        )
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    enc = _encoding()
+    return len(text) // 4 if enc is None else len(enc.encode(text))
+
+
+# Output size is bounded by MAX_NODES/MAX_EDGES, not by the input: a maximal graph is
+# roughly 4k tokens of JSON and reasoning tokens share the budget, so the floor is the
+# old fixed 7000 and only very large inputs (more to reason over) get more.
+_MIN_OUTPUT_TOKENS = 7000
+_MAX_OUTPUT_TOKENS = 8000
+
+
+def _max_output_tokens(project_context: str, interview_transcript: str) -> int:
+    """Output budget (reasoning + JSON), clamped to the output-token floor and cap."""
+    input_tokens = _count_tokens(project_context) + _count_tokens(interview_transcript)
+    return max(_MIN_OUTPUT_TOKENS, min(_MAX_OUTPUT_TOKENS, 3000 + input_tokens // 10))
+
+
+def _cache_path(params: dict) -> str | None:
+    """Cache file for a request: sha256 over model, prompts and schema.
+
+    Any change to those misses the cache.
+    """
+    if not KG_CACHE_DIR:
+        return None
+    h = _BASE_PARAMS_HASH.copy()
+    h.update(params["input"].encode("utf-8"))
+    h.update(str(params["max_output_tokens"]).encode("ascii"))
+    key = h.hexdigest()
+    return os.path.join(KG_CACHE_DIR, f"{key}.json")
+
+
+def _cache_fresh(cache_path: str) -> bool:
+    try:
+        mtime = os.path.getmtime(cache_path)
+    except FileNotFoundError:
+        return False
+    return not KG_CACHE_TTL_SECONDS or time() - mtime < KG_CACHE_TTL_SECONDS
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _write_cache(cache_path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    _write_file(tmp_path, data)
+    os.replace(tmp_path, cache_path)  # atomic: readers never see a partial file
+
+
+async def extract_kg_with_evidence(
+    client: AsyncOpenAI,
+    project_context: str,
+    interview_transcript: str,
+    out_path: str | None = "kg.txt",
+    on_item: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """Extract one KG; the raw output is also written to out_path (None to skip).
+
+    on_item("nodes" | "edges", obj) is called for each node/edge as soon as it has
+    streamed in, before the whole graph is validated (on a cache hit, for every item
+    up front).
+    """
+    params = _request_params(project_context, interview_transcript)
+    cache_path = _cache_path(params)
+    if cache_path and _cache_fresh(cache_path):
+        with open(cache_path, "rb") as f:
+            kg = orjson.loads(f.read())
+        if on_item:
+            for section in ("nodes", "edges"):
+                for item in kg[section]:
+                    on_item(section, item)
+        return kg
+
+    start_time = perf_counter()
+    # Stream the structured output into one buffer; orjson parses the bytes directly.
+    buf = bytearray()
+    usage = None
+    incomplete = None
+    scanner = KGItemScanner() if on_item else None
+    async with client.responses.stream(**params) as stream:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                buf += event.delta.encode("utf-8")
+                if scanner:
+                    for section, item in scanner.feed(event.delta):
+                        on_item(section, item)
+            elif event.type == "response.completed":
+                usage = event.response.usage
+            elif event.type == "response.incomplete":
+                incomplete = event.response
+    end_time = perf_counter()
+    logger.info("kg extracted in %.2fs", end_time - start_time)
+    if usage is not None and usage.input_tokens:
+        cached = usage.input_tokens_details.cached_tokens
+        logger.info(
+            "prompt cache: %d/%d input tokens (%.0f%%)",
+            cached, usage.input_tokens, 100 * cached / usage.input_tokens,
+        )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("kg json: %s", buf.decode("utf-8"))
+    if incomplete is not None:
+        details = incomplete.incomplete_details
+        reason = details.reason if details is not None else "unknown"
+        if reason == "max_output_tokens":
+            limit = params["max_output_tokens"]
+            raise RuntimeError(f"KG output truncated at {limit} tokens")
+        raise RuntimeError(f"KG response incomplete: {reason}")
+    # raises JsonSchemaValueException on a bad graph
+    kg = validate_kg(orjson.loads(buf))
+
+    # Disk writes run in worker threads so concurrent extractions don't block the loop
+    data = bytes(buf)
+    writes = []
+    if out_path:
+        writes.append(asyncio.to_thread(_write_file, out_path, data))
+    if cache_path:
+        writes.append(asyncio.to_thread(_write_cache, cache_path, data))
+    await asyncio.gather(*writes)
+    return kg
+
+
+async def extract_many(
+    client: AsyncOpenAI,
+    pairs: list[tuple[str, str]],
+    max_concurrency: int = 8,
+    use_batch_api: bool = False,
+) -> list[dict | None]:
+    """Extract one KG per (project_context, interview_transcript) pair.
+
+    At most max_concurrency extractions run at a time. Rate-limit (429) retries
+    with backoff are handled by the client (max_retries).
+    use_batch_api=True routes offline jobs through extract_kg_batch_api instead.
+    """
+    if use_batch_api:
+        return await extract_kg_batch_api(client, pairs)
+
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(project_context: str, interview_transcript: str) -> dict:
+        async with sem:
+            return await extract_kg_with_evidence(
+                client, project_context, interview_transcript, out_path=None
+            )
+
+    return await asyncio.gather(*[_one(p, t) for p, t in pairs])
+
+
+class SemanticKGCache:
+    """Reuse a KG when a (context, interview) pair is a near-duplicate of a cached one.
+
+    Off unless enabled (KG_SEMANTIC_CACHE=1); when off, extract() is
+    extract_kg_with_evidence. The context and the interview are embedded separately
+    with the OpenAI embeddings API and both must clear the threshold, so a long
+    context can't mask a different interview. Lookup is a dot product over unit
+    vectors kept in numpy matrices. Persisted under KG_CACHE_DIR in a directory keyed
+    by the request-params hash, so prompt/schema changes start a fresh cache.
+    """
+
+    MAX_EMBED_CHARS = 24_000  # stay under the embedding model's input limit
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        threshold: float = KG_SEMANTIC_THRESHOLD,
+        model: str = "text-embedding-3-small",
+        enabled: bool = KG_SEMANTIC_CACHE,
+    ):
+        self.client = client
+        self.threshold = threshold
+        self.model = model
+        self.enabled = enabled
+        self.dir = os.path.join(
+            KG_CACHE_DIR, "semantic", _BASE_PARAMS_HASH.hexdigest()[:16]
+        )
+        self.context_vectors = np.zeros((0, 0), dtype=np.float32)
+        self.interview_vectors = np.zeros((0, 0), dtype=np.float32)
+        self.kgs: list[dict] = []
+        paths = [
+            os.path.join(self.dir, name)
+            for name in ("context.npy", "interview.npy", "kgs.json")
+        ]
+        if enabled and all(os.path.exists(path) for path in paths):
+            self.context_vectors = np.load(paths[0])
+            self.interview_vectors = np.load(paths[1])
+            with open(paths[2], "rb") as f:
+                self.kgs = orjson.loads(f.read())
+
+    async def embed(
+        self, project_context: str, interview_transcript: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Unit vectors for the context and the interview (one embeddings request)."""
+        resp = await self.client.embeddings.create(
+            model=self.model,
+            input=[
+                project_context[: self.MAX_EMBED_CHARS],
+                interview_transcript[: self.MAX_EMBED_CHARS],
+            ],
+        )
+        vectors = np.asarray([d.embedding for d in resp.data], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0], vectors[1]
+
+    def lookup(self, emb: tuple[np.ndarray, np.ndarray]) -> dict | None:
+        if not self.kgs:
+            return None
+        scores = np.minimum(
+            self.context_vectors @ emb[0], self.interview_vectors @ emb[1]
+        )
+        best = int(np.argmax(scores))
+        return self.kgs[best] if scores[best] >= self.threshold else None
+
+    def add(self, emb: tuple[np.ndarray, np.ndarray], kg: dict) -> None:
+        context, interview = emb
+        if self.kgs:
+            self.context_vectors = np.vstack([self.context_vectors, context])
+            self.interview_vectors = np.vstack([self.interview_vectors, interview])
+        else:
+            self.context_vectors = context[None]
+            self.interview_vectors = interview[None]
+        self.kgs.append(kg)
+        os.makedirs(self.dir, exist_ok=True)
+        np.save(os.path.join(self.dir, "context.npy"), self.context_vectors)
+        np.save(os.path.join(self.dir, "interview.npy"), self.interview_vectors)
+        _write_cache(os.path.join(self.dir, "kgs.json"), orjson.dumps(self.kgs))
+
+    async def extract(
+        self, project_context: str, interview_transcript: str
+    ) -> dict:
+        """extract_kg_with_evidence, short-circuited on a near-duplicate if enabled."""
+        if not self.enabled:
+            return await extract_kg_with_evidence(
+                self.client, project_context, interview_transcript
+            )
+        emb = await self.embed(project_context, interview_transcript)
+        kg = self.lookup(emb)
+        if kg is not None:
+            logger.info("semantic KG cache hit")
+            return kg
+        kg = await extract_kg_with_evidence(
+            self.client, project_context, interview_transcript
+        )
+        self.add(emb, kg)
+        return kg
+
+
+def _response_output_text(body: dict) -> str:
+    """Concatenate output_text parts of a raw Responses API body.
+
+    Same as resp.output_text on a parsed response.
+    """
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
     )
-    end_time = time()
-    print(f"time taken: {end_time - start_time} seconds")
-    print("finish generating kg with evidence")
-    print(resp.output_text)
-    with open("kg.txt", "w") as f:
-        f.write(resp.output_text)
-    return json.loads(resp.output_text)  # JSON string
 
+
+async def submit_kg_batch(client: AsyncOpenAI, pairs: list[tuple[str, str]]) -> str:
+    """Submit one Batch API job (half price, results within 24h) and return its id.
+
+    Request i gets custom_id str(i), so results can be matched back to `pairs`.
+    """
+    lines = [
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": _request_params(project_context, interview_transcript),
+        }, ensure_ascii=False)
+        for i, (project_context, interview_transcript) in enumerate(pairs)
+    ]
+    batch_file = await client.files.create(
+        file=("kg_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    logger.info("submitted batch %s with %d requests", batch.id, len(pairs))
+    return batch.id
+
+
+async def wait_for_batch(
+    client: AsyncOpenAI, batch_id: str, poll_interval: float = 30.0
+) -> dict[int, dict]:
+    """Poll a submitted batch until it finishes; return {request index: KG}.
+
+    Requests that failed inside the batch or returned a graph that doesn't match
+    the schema are left out.
+    """
+    batch = await client.batches.retrieve(batch_id)
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch_id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"KG batch {batch_id} ended with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    results: dict[int, dict] = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        row = orjson.loads(line)
+        response = row.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        try:
+            kg = validate_kg(orjson.loads(_response_output_text(response["body"])))
+        except (orjson.JSONDecodeError, fastjsonschema.JsonSchemaException) as e:
+            logger.warning("request %s returned an invalid KG: %s", row["custom_id"], e)
+            continue
+        results[int(row["custom_id"])] = kg
+    return results
+
+
+async def extract_kg_batch_api(
+    client: AsyncOpenAI,
+    pairs: list[tuple[str, str]],
+    poll_interval: float = 30.0,
+) -> list[dict | None]:
+    """Run extractions through the OpenAI Batch API and wait for them.
+
+    Returns KGs in the order of `pairs`; requests that failed inside the batch or
+    returned a graph that doesn't match the schema come back as None.
+    """
+    batch_id = await submit_kg_batch(client, pairs)
+    results = await wait_for_batch(client, batch_id, poll_interval)
+    return [results.get(i) for i in range(len(pairs))]
@@ -0,0 +1,42 @@
+"""Incremental parsing of the KG JSON while the extraction is still streaming."""
+
+import json
+import re
+
+_SECTION_RE = re.compile(r'"(nodes|edges)"\s*:\s*\[')
+
+
+class KGItemScanner:
+    """Pulls complete node/edge objects out of the KG JSON while it still streams."""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = ""
+        self._section: str | None = None  # "nodes"/"edges" while inside that array
+
+    def feed(self, delta: str) -> list[tuple[str, dict]]:
+        text = self._text + delta
+        pos = 0
+        items = []
+        while True:
+            if self._section is None:
+                m = _SECTION_RE.search(text, pos)
+                if not m:
+                    break
+                self._section, pos = m.group(1), m.end()
+                continue
+            while pos < len(text) and text[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(text):
+                break
+            if text[pos] == "]":
+                self._section, pos = None, pos + 1
+                continue
+            try:
+                obj, pos_end = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break  # object not complete yet
+            items.append((self._section, obj))
+            pos = pos_end
+        self._text = text[pos:]
+        return items
@@ -1,61 +1,287 @@
-from neo4j import GraphDatabase
-import json
+import asyncio
+import atexit
+import functools
+import hashlib
+import queue
+import re
+import threading
+from collections import defaultdict
+
+import orjson
+from neo4j import AsyncDriver, AsyncGraphDatabase, Driver, GraphDatabase
+
+_SCHEMA_QUERIES = (
+    "CREATE CONSTRAINT entity_id IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT evidence_id IF NOT EXISTS "
+    "FOR (v:Evidence) REQUIRE v.id IS UNIQUE",
+)
+
+# One pooled driver per (uri, user) for the life of the process; closed at exit.
+_drivers: dict[tuple[str, str], Driver] = {}
+
+
+def get_driver(uri: str, user: str, password: str) -> Driver:
+    key = (uri, user)
+    if key not in _drivers:
+        _drivers[key] = GraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=32,
+            connection_acquisition_timeout=30,
+            keep_alive=True,
+        )
+        with _drivers[key].session() as session:
+            ensure_schema(session)
+    return _drivers[key]
+
+
+# Async drivers are bound to the event loop that created them, so they are keyed by
+# loop too.
+_async_drivers: dict[tuple[int, str, str], AsyncDriver] = {}
+
+
+async def get_async_driver(uri: str, user: str, password: str) -> AsyncDriver:
+    key = (id(asyncio.get_running_loop()), uri, user)
+    if key not in _async_drivers:
+        driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=32,
+            connection_acquisition_timeout=30,
+            keep_alive=True,
+        )
+        async with driver.session() as session:
+            for query in _SCHEMA_QUERIES:
+                await session.run(query)
+        _async_drivers[key] = driver
+    return _async_drivers[key]
+
+
+async def warm_neo4j(uri: str, user: str, password: str):
+    """Open the async pool, ensure the schema and check connectivity.
+
+    Run ahead of the first write so it doesn't pay for the setup.
+    """
+    driver = await get_async_driver(uri, user, password)
+    await driver.verify_connectivity()
+
+
+async def close_async_drivers():
+    """Close the async drivers of the running loop; await before the loop ends."""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _async_drivers if k[0] == loop_id]:
+        await _async_drivers.pop(key).close()
+
+
+def ensure_schema(session):
+    """Unique indexes on :Entity(id) / :Evidence(id).
+
+    MERGE/MATCH by id are then index seeks, not label scans.
+    """
+    for query in _SCHEMA_QUERIES:
+        session.run(query)
+
+
+@atexit.register
+def _close_drivers():
+    for driver in _drivers.values():
+        driver.close()
+    _drivers.clear()
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _normalize_evidence(ev: dict) -> dict:
+    """Evidence with its quote stripped and whitespace runs collapsed.
+
+    Re-wrapped copies of a citation then share one id. Quotes are kept as plain
+    text (not compressed) so they stay readable and searchable in Neo4j.
+    """
+    quote = ev.get("quote")
+    if not isinstance(quote, str):
+        return ev
+    return {**ev, "quote": _WS_RE.sub(" ", quote).strip()}
+
+
+def _evidence_ids(item: dict, evidence_table: dict[str, dict]) -> list[str]:
+    """Content ids for an item's evidence; each distinct object is tabled once."""
+    ids = []
+    for ev in item.get("evidence", []):
+        ev = _normalize_evidence(ev)
+        ev_json = orjson.dumps(ev, option=orjson.OPT_SORT_KEYS)
+        ev_id = hashlib.sha256(ev_json).hexdigest()
+        evidence_table.setdefault(ev_id, {"id": ev_id, "props": ev})
+        ids.append(ev_id)
+    return ids
+
+
+def _node_row(n: dict, evidence_table: dict[str, dict]) -> dict:
+    return {
+        "id": n["id"],
+        "name": n["name"],
+        # nodes carry no confidence in the extraction schema
+        "confidence": float(n.get("confidence", 1.0)),
+        "evidence_ids": _evidence_ids(n, evidence_table),
+        "props": n.get("properties", {}) or {},
+    }
+
+
+def _edge_row(e: dict, evidence_table: dict[str, dict]) -> dict:
+    return {
+        "sid": e["source"],
+        "tid": e["target"],
+        "confidence": float(e["confidence"]),
+        "evidence_ids": _evidence_ids(e, evidence_table),
+        "props": e.get("properties", {}) or {},
+    }
+
+
+_EVIDENCE_QUERY = """
+UNWIND $rows AS r
+MERGE (v:Evidence {id:r.id})
+SET v += r.props
+"""
+
+_NODE_QUERY = """
+UNWIND $rows AS r
+MERGE (x:Entity {{id:r.id}})
+SET x:{t}
+SET x.name = r.name,
+    x.confidence = r.confidence,
+    x.evidence_ids = r.evidence_ids
+SET x += r.props
+"""
+
+_EDGE_QUERY = """
+UNWIND $rows AS r
+MATCH (a:Entity {{id:r.sid}}), (b:Entity {{id:r.tid}})
+MERGE (a)-[e:{t}]->(b)
+SET e.confidence = r.confidence,
+    e.evidence_ids = r.evidence_ids
+SET e += r.props
+"""
+
+
+# Labels / relationship types are spliced into the query text, so only plain
+# identifiers get through
+_LABEL_RE = re.compile(r"^[A-Za-z_]\w*$")
+
+
+@functools.lru_cache(maxsize=256)
+def _typed_query(query: str, t: str) -> str:
+    """query with its label filled in.
+
+    The same (query, label) always yields the same string object.
+    """
+    if not _LABEL_RE.match(t):
+        raise ValueError(f"invalid Neo4j label/relationship type: {t!r}")
+    return query.format(t=t)
+
+
+def _by_type(
+    items: list[dict], row, query: str, evidence_table: dict[str, dict]
+) -> list[tuple[str, list[dict]]]:
+    by_type = defaultdict(list)
+    for item in items:
+        by_type[item["type"]].append(row(item, evidence_table))
+    return [(_typed_query(query, t), rows) for t, rows in by_type.items()]
+
+
+def _plan(nodes: list[dict], edges: list[dict]) -> list[list[tuple[str, list[dict]]]]:
+    """Write stages of (query, rows); statements within a stage are independent.
+
+    One UNWIND per node label / relationship type (labels can't be parameters).
+    Every node also gets the shared :Entity label, which carries the id constraint.
+    Evidence is deduplicated across the graph into :Evidence nodes that items
+    reference by id (evidence_ids) instead of each carrying its own copy.
+    """
+    evidence_table: dict[str, dict] = {}
+    node_statements = _by_type(nodes, _node_row, _NODE_QUERY, evidence_table)
+    edge_statements = _by_type(edges, _edge_row, _EDGE_QUERY, evidence_table)
+    evidence_statements = (
+        [(_EVIDENCE_QUERY, list(evidence_table.values()))] if evidence_table else []
+    )
+    return [evidence_statements + node_statements, edge_statements]
+
+
+def _write_items(tx, nodes: list[dict], edges: list[dict]):
+    for stage in _plan(nodes, edges):
+        for query, rows in stage:
+            tx.run(query, rows=rows)
+
 
 def upsert_neo4j_with_evidence(uri: str, user: str, password: str, kg: dict):
-    driver = GraphDatabase.driver(uri, auth=(user, password))
-
-    def run(tx, query, params=None):
-        tx.run(query, params or {})
-
-    with driver.session() as session:
-        # Nodes
-        for n in kg["nodes"]:
-            props = n.get("properties", {}) or {}
-            session.execute_write(
-                run,
-                f"""
-                MERGE (x:{n['type']} {{id:$id}})
-                SET x.name = $name,
-                    x.confidence = $confidence,
-                    x.evidence_json = $evidence_json
-                SET x += $props
-                """,
-                {
-                    "id": n["id"],
-                    "name": n["name"],
-                    "confidence": float(n["confidence"]),
-                    "evidence_json": json.dumps(n.get("evidence", []), ensure_ascii=False),
-                    "props": props,
-                },
-            )
-
-        # Edges
-        for e in kg["edges"]:
-            props = e.get("properties", {}) or {}
-            session.execute_write(
-                run,
-                f"""
-                MATCH (a {{id:$sid}}), (b {{id:$tid}})
-                MERGE (a)-[r:{e['type']}]->(b)
-                SET r.confidence = $confidence,
-                    r.evidence_json = $evidence_json
-                SET r += $props
-                """,
-                {
-                    "sid": e["source"],
-                    "tid": e["target"],
-                    "confidence": float(e["confidence"]),
-                    "evidence_json": json.dumps(e.get("evidence", []), ensure_ascii=False),
-                    "props": props,
-                },
-            )
-
-    driver.close()
+    # Whole graph in one transaction: one round trip per distinct node/edge type
+    with get_driver(uri, user, password).session() as session:
+        session.execute_write(_write_items, kg["nodes"], kg["edges"])
+
+
+async def _awrite_statement(driver: AsyncDriver, query: str, rows: list[dict]):
+    async def work(tx):
+        await tx.run(query, rows=rows)
+
+    async with driver.session() as session:
+        await session.execute_write(work)
+
+
+async def aupsert_neo4j_with_evidence(uri: str, user: str, password: str, kg: dict):
+    """Async upsert: per-type statements run concurrently.
+
+    Evidence and nodes are written before any edge group.
+    """
+    driver = await get_async_driver(uri, user, password)
+    for stage in _plan(kg["nodes"], kg["edges"]):
+        await asyncio.gather(*(_awrite_statement(driver, q, rows) for q, rows in stage))
+
+
+class Neo4jStreamWriter:
+    """Upserts nodes/edges on a background thread as they arrive (e.g. mid-stream).
+
+    Whatever has queued up since the last write goes out as one transaction (nodes
+    before edges, so edges find their endpoints). close() waits for the queue and
+    re-raises a write error.
+    """
+
+    def __init__(self, uri: str, user: str, password: str):
+        self._driver = get_driver(uri, user, password)
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def put(self, section: str, item: dict):
+        self._queue.put((section, item))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _drain(self):
+        with self._driver.session() as session:
+            done = False
+            while not done:
+                batch = [self._queue.get()]
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                if batch[-1] is None:
+                    done = True
+                    batch.pop()
+                if self._error is not None or not batch:
+                    continue  # keep draining so close() doesn't hang
+                nodes = [item for section, item in batch if section == "nodes"]
+                edges = [item for section, item in batch if section == "edges"]
+                try:
+                    session.execute_write(_write_items, nodes, edges)
+                except Exception as e:
+                    self._error = e
 
 if __name__ == "__main__":
-    with open("kg.json", "r") as f:
-        kg = json.load(f)
+    with open("kg.json", "rb") as f:
+        kg = orjson.loads(f.read())
     uri = "neo4j://127.0.0.1:7687"
     user = "neo4j"
     password = "12345678"
-    upsert_neo4j_with_evidence(uri, user, password, kg)
\ No newline at end of file
+    upsert_neo4j_with_evidence(uri, user, password, kg)
@@ -1,62 +1,278 @@
-from openai import OpenAI
-from kg import extract_kg_with_evidence
-from hash import normalize_and_hash_evidence
-from neo4j_ import upsert_neo4j_with_evidence
-import json
-import sys
+import asyncio
+import hashlib
+import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from kg import (
+    _BASE_PARAMS_HASH,
+    TASK,
+    extract_kg_with_evidence,
+    extract_many,
+    submit_kg_batch,
+    wait_for_batch,
+)
+from neo4j_ import (
+    Neo4jStreamWriter,
+    aupsert_neo4j_with_evidence,
+    close_async_drivers,
+    upsert_neo4j_with_evidence,
+    warm_neo4j,
+)
+from openai import AsyncOpenAI
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from backend.parse_cli import parse_file
 
+KG_PATH = "public/kg.json"
+KG_META_PATH = "public/kg.json.meta"  # input hash of the run that produced KG_PATH
+NEO4J = ("bolt://localhost:7687", "neo4j", "password")  # uri, user, password
 
+logger = logging.getLogger(__name__)
 
-def build_and_store_kg(project_context: str, interview_transcript: str):
-    client = OpenAI()
 
-    kg_json = extract_kg_with_evidence(client, project_context, interview_transcript)
+
+def build_and_store_kg(
+    project_context: str,
+    interview_transcript: str,
+    snippet_hashes: dict[str, str] | None = None,
+):
+    client = AsyncOpenAI()
+
+    kg_json = asyncio.run(
+        extract_kg_with_evidence(client, project_context, interview_transcript)
+    )
     # print(f"kg_json: {kg_json}")
-    with open("./public/kg.json", "w") as f:
-        json.dump(kg_json, f)
+    if snippet_hashes is not None:
+        interview_ref = _sha256_ref(interview_transcript.encode("utf-8"))
+        _fill_snippet_hashes(kg_json, snippet_hashes, interview_ref)
+    _write_kg(kg_json)
     return kg_json
 
+def build_store_and_upsert_kg(
+    project_context: str,
+    interview_transcript: str,
+    snippet_hashes: dict[str, str] | None = None,
+) -> dict:
+    """build_and_store_kg + Neo4j upsert.
+
+    The driver/pool/schema warm-up runs during generation.
+    """
+    async def run():
+        warm = asyncio.create_task(warm_neo4j(*NEO4J))
+        try:
+            kg_json = await extract_kg_with_evidence(
+                AsyncOpenAI(), project_context, interview_transcript
+            )
+            if snippet_hashes is not None:
+                interview_ref = _sha256_ref(interview_transcript.encode("utf-8"))
+                _fill_snippet_hashes(kg_json, snippet_hashes, interview_ref)
+            # Stored before Neo4j is touched, so a failed warm-up or upsert doesn't
+            # lose the extraction
+            await asyncio.to_thread(_write_kg, kg_json)
+            await warm
+            await aupsert_neo4j_with_evidence(*NEO4J, kg_json)
+            return kg_json
+        finally:
+            if not warm.done():
+                warm.cancel()
+            await close_async_drivers()
+
+    return asyncio.run(run())
+
+def _sha256_ref(data: bytes) -> str:
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+def _norm_path(path: str) -> str:
+    path = os.path.normpath(path.strip().replace("\\", "/")).replace("\\", "/")
+    return "" if path == "." else path
+
+def _fill_snippet_hashes(
+    kg_json: dict, file_hashes: dict[str, str], interview_hash: str
+):
+    """Set snippet_hash on every citation from the hashes taken at ingest.
+
+    file_hashes maps each ingested file path to its hash. Paths are compared
+    normalized, then by file name when that names exactly one ingested file.
+    A file citation that still matches nothing gets snippet_hash None and is
+    logged, rather than a blank hash that looks like a real one.
+    """
+    by_path = {_norm_path(p): h for p, h in file_hashes.items()}
+    by_name: dict[str, str | None] = {}
+    for p, h in by_path.items():
+        name = os.path.basename(p)
+        by_name[name] = h if name not in by_name else None  # None: ambiguous
+    unmatched = set()
+    for item in (*kg_json["nodes"], *kg_json["edges"]):
+        for ev in item["evidence"]:
+            if ev["source_type"] != "file":
+                ev["snippet_hash"] = interview_hash
+                continue
+            path = _norm_path(ev["path"])
+            snippet_hash = by_path.get(path) or by_name.get(os.path.basename(path))
+            if snippet_hash is None:
+                unmatched.add(ev["path"])
+            ev["snippet_hash"] = snippet_hash
+    if unmatched:
+        logger.warning(
+            "no ingested file matches cited path(s) %s; their snippet_hash is null",
+            sorted(unmatched),
+        )
+
+def _write_kg(kg_json: dict):
+    # Whatever run wrote the meta no longer produced KG_PATH; build_kg records its
+    # own hash after this
+    if os.path.exists(KG_META_PATH):
+        os.remove(KG_META_PATH)
+    with open(KG_PATH, "wb") as f:
+        f.write(orjson.dumps(kg_json))
+
+def build_many_kgs(
+    jobs: list[tuple[str, str]], use_batch_api: bool = False
+) -> list[dict | None]:
+    """Extract one KG per (project_context, interview_transcript) job.
+
+    The LLM calls overlap.
+    """
+    client = AsyncOpenAI()
+    return asyncio.run(extract_many(client, jobs, use_batch_api=use_batch_api))
+
+def submit_kg_backfill(jobs: list[tuple[str, str]]) -> str:
+    """Offline path: queue KG extraction for many jobs on the Batch API.
+
+    Returns the batch id.
+    """
+    return asyncio.run(submit_kg_batch(AsyncOpenAI(), jobs))
+
+def store_kg_backfill(batch_id: str) -> int:
+    """Wait for a backfill batch and upsert every KG it produced into Neo4j.
+
+    Returns how many were upserted.
+    """
+    kgs = asyncio.run(wait_for_batch(AsyncOpenAI(), batch_id))
+    for kg in kgs.values():
+        upsert_neo4j_with_evidence(*NEO4J, kg)
+    return len(kgs)
+
+def stream_kg_to_neo4j(project_context: str, interview_transcript: str) -> dict:
+    """Extract a KG; each node/edge is upserted into Neo4j while the rest generates."""
+    writer = Neo4jStreamWriter(*NEO4J)
+    try:
+        return asyncio.run(extract_kg_with_evidence(
+            AsyncOpenAI(), project_context, interview_transcript, on_item=writer.put,
+        ))
+    finally:
+        writer.close()
+
+def build_many_kgs_into_neo4j(
+    jobs: list[tuple[str, str]], max_concurrency: int = 8
+) -> list[dict]:
+    """Extract a KG per job and upsert each into Neo4j as soon as it is ready.
+
+    Async end to end, so one job's Neo4j write overlaps the others' LLM generation.
+    """
+    async def run():
+        client = AsyncOpenAI()
+        sem = asyncio.Semaphore(max_concurrency)
+        warm = asyncio.create_task(warm_neo4j(*NEO4J))
+
+        async def one(project_context: str, interview_transcript: str) -> dict:
+            async with sem:
+                kg = await extract_kg_with_evidence(
+                    client, project_context, interview_transcript, out_path=None
+                )
+            await warm
+            await aupsert_neo4j_with_evidence(*NEO4J, kg)
+            return kg
+
+        try:
+            return await asyncio.gather(*(one(p, t) for p, t in jobs))
+        finally:
+            if not warm.done():
+                warm.cancel()
+            await close_async_drivers()
+
+    return asyncio.run(run())
+
 def show_kg(kg_path: str):
-    with open(kg_path, "r") as f:
-        kg = json.load(f)
-    upsert_neo4j_with_evidence("bolt://localhost:7687", "neo4j", "password", kg)
+    with open(kg_path, "rb") as f:
+        kg = orjson.loads(f.read())
+    upsert_neo4j_with_evidence(*NEO4J, kg)
     
 
 def build_project_context(file_paths: list[str]) -> str:
-    project_context = ""
+    parts: list[str] = []
     for file_path in file_paths:
-        project_context += f"File: {file_path}\n"
-        project_context += str(parse_file(file_path))
-        project_context += "\n"
-    return project_context
+        parts.append(f"File: {file_path}\n")
+        parts.append(str(parse_file(file_path)))
+        parts.append("\n")
+    return "".join(parts)
 
 def build_interview_transcript(interview_transcript_path: str) -> str:
     with open(interview_transcript_path, "r") as f:
         interview_transcript = f.read()
     return interview_transcript
 
+def _load_parsed_file(path: str) -> tuple[bytes, str, str, str]:
+    """(sha256 of the raw file, its source path, sha256 ref of its content, FILE block).
+
+    The FILE block is the file's section of the project context.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    file_content = orjson.loads(raw)
+    block = (
+        f"<<<FILE path='{file_content['file_path']}'>>>"
+        f"{file_content['content']}<<</FILE>>>\n"
+    )
+    content_hash = _sha256_ref(file_content["content"].encode("utf-8"))
+    return hashlib.sha256(raw).digest(), file_content["file_path"], content_hash, block
+
 def build_kg(interview_summary:str, parsed_directory: str = "output/parsed") -> str:
-    project_context = ""
-    for file in os.listdir(parsed_directory):
-        if file.endswith(".json"):
-            with open(os.path.join(parsed_directory, file), "r") as f:
-                file_content = json.load(f)
-                project_context += f"<<<FILE path='{file_content['file_path']}'>>>"
-                project_context += str(file_content['content'])
-                project_context += "<<</FILE>>>\n"
-    kg_json = build_and_store_kg(project_context, interview_summary)
-    with open(f"public/kg.json", "w") as f:
-        json.dump(kg_json, f)
+    # Read + decode the parsed files in parallel (I/O bound); sorted so the context
+    # is stable across runs
+    names = sorted(f for f in os.listdir(parsed_directory) if f.endswith(".json"))
+    paths = [os.path.join(parsed_directory, n) for n in names]
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        loaded = list(ex.map(_load_parsed_file, paths))
+
+    # Hash of the request setup (model, system prompt, schema, task text), (name,
+    # content digest) pairs and the interview; unchanged inputs under an unchanged
+    # prompt reuse the stored KG
+    h = hashlib.sha256(_BASE_PARAMS_HASH.digest())
+    h.update(TASK.encode("utf-8"))
+    for name, (digest, *_) in zip(names, loaded):
+        h.update(name.encode("utf-8"))
+        h.update(digest)
+    h.update(interview_summary.encode("utf-8"))
+    input_hash = h.hexdigest()
+    if os.path.exists(KG_PATH) and os.path.exists(KG_META_PATH):
+        with open(KG_META_PATH, "rb") as f:
+            if orjson.loads(f.read()).get("input_hash") == input_hash:
+                with open(KG_PATH, "rb") as kg_file:
+                    return orjson.loads(kg_file.read())
+
+    project_context = "".join(block for *_, block in loaded)
+    # Content hashes come from the bytes already read above, so citations get
+    # their snippet_hash without re-reading or re-hashing any file
+    snippet_hashes = {
+        file_path: content_hash for _, file_path, content_hash, _ in loaded
+    }
+    # build_and_store_kg already writes public/kg.json
+    kg_json = build_and_store_kg(project_context, interview_summary, snippet_hashes)
+    with open(KG_META_PATH, "wb") as f:
+        f.write(orjson.dumps({"input_hash": input_hash}))
     return kg_json
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     file_paths = ["public/artifacts/alice-chen/Risk_Committee_Notes.md", "public/artifacts/alice-chen/Q3_Loss_Forecast.json"]
     for file_path in file_paths:
         res = parse_file(file_path)
-        json.dump(res.to_dict(), open(f"mock/{file_path.split('/')[-1]}.json", "w"))
+        with open(f"mock/{file_path.split('/')[-1]}.json", "wb") as f:
+            f.write(orjson.dumps(res.to_dict(), default=str))
     interview_summary = build_interview_transcript("src/data/short_interview.md")
     build_kg(interview_summary, "mock")
     print("finish building and storing kg")
@@ -10,10 +10,12 @@ customer segments based on historical data and macroeconomic factors.
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
 
 # Segment definitions
 SEGMENTS = ['prime', 'near_prime', 'subprime', 'deep_subprime']
+_SEGMENT_SET = frozenset(SEGMENTS)
 
 # Historical loss rates (updated quarterly)
 HISTORICAL_LOSS_RATES = {
@@ -43,6 +45,16 @@ def apply_macro_factors(segment_data: Dict, macro_indicators: Optional[Dict] = N
     if macro_indicators is None:
         return 1.0
 
+    # Same indicators → same factor; memoized on the sorted items
+    try:
+        return _macro_adjustment(tuple(sorted(macro_indicators.items())))
+    except TypeError:  # unhashable indicator values can't be a cache key
+        return _macro_adjustment.__wrapped__(tuple(macro_indicators.items()))
+
+
+@lru_cache(maxsize=256)
+def _macro_adjustment(macro_items: tuple) -> float:
+    macro_indicators = dict(macro_items)
     adjustment = 1.0
 
     # Unemployment impact
@@ -80,25 +92,24 @@ def generate_quarterly_forecast(portfolio_data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with forecasted losses by segment
     """
-    results = []
-
-    for segment in SEGMENTS:
-        segment_data = {
-            'segment': segment,
-            'exposure': portfolio_data[portfolio_data['segment'] == segment]['exposure'].sum()
-        }
-
-        loss_rate = calculate_loss_forecast(segment_data)
-
-        results.append({
-            'segment': segment,
-            'exposure': segment_data['exposure'],
-            'model_loss_rate': loss_rate,
-            'adjustment': 0,  # Filled in manually by analyst
-            'final_loss_rate': loss_rate  # Updated after adjustment
-        })
-
-    return pd.DataFrame(results)
+    # One grouped pass over the portfolio instead of a mask per segment
+    exposure = (
+        portfolio_data.groupby('segment', sort=False)['exposure'].sum()
+        .reindex(SEGMENTS, fill_value=0)
+    )
+    # Rates still come from calculate_loss_forecast, one call per segment
+    loss_rate = [
+        calculate_loss_forecast({'segment': segment, 'exposure': seg_exposure})
+        for segment, seg_exposure in zip(SEGMENTS, exposure.values)
+    ]
+
+    return pd.DataFrame({
+        'segment': SEGMENTS,
+        'exposure': exposure.values,
+        'model_loss_rate': loss_rate,
+        'adjustment': 0,  # Filled in manually by analyst
+        'final_loss_rate': loss_rate  # Updated after adjustment
+    })
 
 
 def validate_forecast(forecast_df: pd.DataFrame) -> bool:
@@ -111,13 +122,13 @@ def validate_forecast(forecast_df: pd.DataFrame) -> bool:
     - Adjustments documented (somehow?)
     """
     # Check all segments present
-    if set(forecast_df['segment']) != set(SEGMENTS):
+    if set(forecast_df['segment']) != _SEGMENT_SET:
         return False
 
     # Check loss rates are reasonable
-    for _, row in forecast_df.iterrows():
-        if row['final_loss_rate'] < 0 or row['final_loss_rate'] > 0.5:
-            return False
+    rates = forecast_df['final_loss_rate'].to_numpy()
+    if not np.all((rates >= 0) & (rates <= 0.5)):
+        return False
 
     # TODO: Check that adjustments are documented
     # Currently no way to enforce this
@@ -6,13 +6,22 @@ Last Updated: 2024-08-01
 Defines thresholds for triggering various risk management actions.
 """
 
+from bisect import bisect_right
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable
+
+import numpy as np
+
 # Segment risk thresholds - loss rate triggers for escalation
-SEGMENT_THRESHOLDS = {
+# (read-only: the derived tables below are computed from it once at import)
+SEGMENT_THRESHOLDS = MappingProxyType({
     "prime": 0.03,        # 3% loss rate - well documented
     "near_prime": 0.07,   # 7% loss rate - well documented
     "subprime": 0.15,     # 15% - but Alice uses different number?
     "deep_subprime": None # No threshold set - ask Alice
-}
+})
 
 # Note: Alice knows the real thresholds for subprime and deep_subprime
 # They change based on portfolio composition
@@ -45,12 +54,12 @@ DELINQUENCY_THRESHOLDS = {
 
 # Overlay caps by segment
 # Maximum adjustment that can be applied
-OVERLAY_CAPS = {
+OVERLAY_CAPS = MappingProxyType({
     "prime": 0.01,        # Max 1% overlay
     "near_prime": 0.02,   # Max 2% overlay
     "subprime": 0.05,     # Max 5% overlay
     "deep_subprime": None # No cap defined - Alice decides
-}
+})
 
 # Model staleness threshold (days)
 MODEL_STALENESS_DAYS = 30  # Recalibration needed after 30 days
@@ -62,6 +71,106 @@ ESCALATION_THRESHOLDS = {
     "board_notification": 10000000     # $10M impact
 }
 
+# Default behavior when no threshold set
+# This should probably be documented better
+_FAILSAFE_THRESHOLD = 0.30  # 30% as failsafe
+# SEGMENT_THRESHOLDS with the failsafe filled in, so get_threshold is one lookup
+_SEGMENT_LIMITS = {
+    segment: _FAILSAFE_THRESHOLD if threshold is None else threshold
+    for segment, threshold in SEGMENT_THRESHOLDS.items()
+}
+
+
+class SegmentID(IntEnum):
+    """Integer ids for the segments in SEGMENT_THRESHOLDS, for per-row loops."""
+    PRIME = 0
+    NEAR_PRIME = 1
+    SUBPRIME = 2
+    DEEP_SUBPRIME = 3
+
+
+# Effective thresholds indexed by SegmentID
+_SEG_THR = tuple(_SEGMENT_LIMITS[seg.name.lower()] for seg in SegmentID)
+
+# Sorted cut points for check_variance; _VAR_LABELS[i] covers variances
+# >= _VAR_THRESH[i - 1]
+_VAR_LABELS = ("normal", "warning", "action", "critical")
+_VAR_THRESH = tuple(VARIANCE_THRESHOLDS[level] for level in _VAR_LABELS[1:])
+
+
+class VarLevel(IntEnum):
+    """Integer codes for the check_variance levels; _VAR_LABELS[code] is the label."""
+    NORMAL = 0
+    WARNING = 1
+    ACTION = 2
+    CRITICAL = 3
+
+
+_VAR_LEVELS = tuple(VarLevel)
+
+# Array forms for the batch functions (the tuple stays for bisect on scalars)
+_VAR_THRESH_ARRAY = np.array(_VAR_THRESH)
+_VAR_THRESH_F32 = _VAR_THRESH_ARRAY.astype(np.float32)
+_VAR_LABEL_ARRAY = np.array(_VAR_LABELS)
+
+# Flat (elevated, high) cut points of DELINQUENCY_THRESHOLDS, indexed by bucket id;
+# the "normal" level is informational, anything below "elevated" classifies as normal
+DQ_30_DAY, DQ_60_DAY, DQ_90_DAY = 0, 1, 2
+_DQ_TABLE = tuple(
+    (DELINQUENCY_THRESHOLDS[bucket]["elevated"], DELINQUENCY_THRESHOLDS[bucket]["high"])
+    for bucket in ("30_day", "60_day", "90_day")
+)
+
+# Overlay caps indexed by SegmentID; NaN where no cap is defined
+_OVERLAY_CAP_ARRAY = np.array([
+    np.nan if OVERLAY_CAPS[seg.name.lower()] is None else OVERLAY_CAPS[seg.name.lower()]
+    for seg in SegmentID
+])
+
+# (threshold, label) tiers in ascending order; a new tier in the config only needs
+# its label here
+_ESC_TIERS = tuple(sorted(
+    (ESCALATION_THRESHOLDS[key], label)
+    for key, label in (
+        ("risk_committee_review", "risk_committee"),
+        ("cfo_approval", "cfo"),
+        ("board_notification", "board"),
+    )
+))
+_ESC_TIER_THRESH = tuple(threshold for threshold, _ in _ESC_TIERS)
+_ESC_TIER_LABELS = ("none",) + tuple(label for _, label in _ESC_TIERS)
+_ESC_LABELS = np.array(_ESC_TIER_LABELS)
+
+
+class EscLevel(IntEnum):
+    """Integer codes for the should_escalate levels; _ESC_LABELS[code] is the label."""
+    NONE = 0
+    RISK_COMMITTEE = 1
+    CFO = 2
+    BOARD = 3
+
+
+_ESC_THRESH = np.array(_ESC_TIER_THRESH, dtype=float)
+_ESC_LEVELS = tuple(EscLevel)
+for _table in (
+    _VAR_THRESH_ARRAY, _VAR_THRESH_F32, _VAR_LABEL_ARRAY,
+    _OVERLAY_CAP_ARRAY, _ESC_LABELS, _ESC_THRESH,
+):
+    _table.setflags(write=False)
+del _table
+
+
+def _tier(thresholds: tuple, value: float) -> int:
+    """bisect_right, but NaN lands in the lowest tier, as the old if/elif did."""
+    return bisect_right(thresholds, value) if value == value else 0
+
+
+def _tiers(values: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """_tier over an array: np.digitize, with NaN put in the lowest tier."""
+    values = np.asarray(values)
+    codes = np.digitize(values, thresholds)
+    return np.where(np.isnan(values), 0, codes)
+
 
 def get_threshold(segment: str) -> float:
     """
@@ -70,12 +179,18 @@ def get_threshold(segment: str) -> float:
     Note: For subprime and deep_subprime, the actual thresholds
     may differ from what's configured here. Check with Alice.
     """
-    threshold = SEGMENT_THRESHOLDS.get(segment)
-    if threshold is None:
-        # Default behavior when no threshold set
-        # This should probably be documented better
-        return 0.30  # 30% as failsafe
-    return threshold
+    return _SEGMENT_LIMITS.get(segment, _FAILSAFE_THRESHOLD)
+
+
+@lru_cache(maxsize=16)
+def segment_id(segment: str) -> SegmentID:
+    """Map a segment name to its SegmentID (once, at the API boundary)."""
+    return SegmentID[segment.upper()]
+
+
+def get_threshold_id(segment: SegmentID) -> float:
+    """get_threshold for a SegmentID: a tuple index, no string hashing."""
+    return _SEG_THR[segment]
 
 
 def should_escalate(impact_amount: float) -> str:
@@ -84,13 +199,26 @@ def should_escalate(impact_amount: float) -> str:
 
     Returns: 'none', 'risk_committee', 'cfo', or 'board'
     """
-    if impact_amount >= ESCALATION_THRESHOLDS["board_notification"]:
-        return "board"
-    elif impact_amount >= ESCALATION_THRESHOLDS["cfo_approval"]:
-        return "cfo"
-    elif impact_amount >= ESCALATION_THRESHOLDS["risk_committee_review"]:
-        return "risk_committee"
-    return "none"
+    return _ESC_TIER_LABELS[_tier(_ESC_TIER_THRESH, impact_amount)]
+
+
+def escalation_level(impact_amount: float) -> EscLevel:
+    """should_escalate as an EscLevel, for callers that compare rather than display."""
+    return _ESC_LEVELS[_tier(_ESC_TIER_THRESH, impact_amount)]
+
+
+def classify_delinquency(bucket_id: int, rate: float) -> str:
+    """
+    Classify a delinquency rate for a bucket (DQ_30_DAY, DQ_60_DAY or DQ_90_DAY).
+
+    Returns: 'normal', 'elevated', or 'high'
+    """
+    elevated, high = _DQ_TABLE[bucket_id]
+    if rate >= high:
+        return "high"
+    elif rate >= elevated:
+        return "elevated"
+    return "normal"
 
 
 def check_variance(expected: float, actual: float) -> str:
@@ -104,10 +232,97 @@ def check_variance(expected: float, actual: float) -> str:
 
     variance = abs(actual - expected) / expected
 
-    if variance >= VARIANCE_THRESHOLDS["critical"]:
-        return "critical"
-    elif variance >= VARIANCE_THRESHOLDS["action"]:
-        return "action"
-    elif variance >= VARIANCE_THRESHOLDS["warning"]:
-        return "warning"
-    return "normal"
+    # bisect_right puts a variance equal to a threshold at that threshold's level
+    return _VAR_LABELS[_tier(_VAR_THRESH, variance)]
+
+
+def variance_level(expected: float, actual: float) -> VarLevel:
+    """check_variance as a VarLevel, for callers that compare rather than display."""
+    if expected == 0:
+        return VarLevel.CRITICAL if actual > 0 else VarLevel.NORMAL
+    return _VAR_LEVELS[_tier(_VAR_THRESH, abs(actual - expected) / expected)]
+
+
+def make_variance_checker(expected: float) -> Callable[[float], str]:
+    """
+    check_variance with expected fixed, for checking many actuals against one forecast.
+
+    The division is done once: each call multiplies by 1/expected, so a variance
+    within float rounding of a threshold can land on the other side of it.
+    """
+    if expected == 0:
+        return lambda actual: "critical" if actual > 0 else "normal"
+
+    inv_expected = 1.0 / expected
+
+    def check(actual: float) -> str:
+        return _VAR_LABELS[_tier(_VAR_THRESH, abs(actual - expected) * inv_expected)]
+
+    return check
+
+
+def should_escalate_batch(impact_amounts: np.ndarray) -> np.ndarray:
+    """
+    should_escalate over an array of dollar impacts.
+
+    Returns: array of 'none', 'risk_committee', 'cfo', or 'board'
+    """
+    return _ESC_LABELS[_tiers(impact_amounts, _ESC_THRESH)]
+
+
+def check_variance_batch(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    check_variance over paired arrays of expected and actual values.
+
+    Returns: array of 'normal', 'warning', 'action', or 'critical'
+    """
+    return _VAR_LABEL_ARRAY[_variance_codes(expected, actual)]
+
+
+def check_variance_batch_f32(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    check_variance_batch in float32, for large runs where bandwidth matters more
+    than precision.
+
+    Variances within float32 rounding of a threshold may classify differently
+    from the float64 version.
+    """
+    codes = _variance_codes(expected, actual, np.float32, _VAR_THRESH_F32)
+    return _VAR_LABEL_ARRAY[codes]
+
+
+def _variance_codes(
+    expected: np.ndarray,
+    actual: np.ndarray,
+    dtype: type = np.float64,
+    thresholds: np.ndarray = _VAR_THRESH_ARRAY,
+) -> np.ndarray:
+    """Indexes into _VAR_LABELS for paired arrays of expected and actual values."""
+    expected = np.asarray(expected, dtype=dtype)
+    actual = np.asarray(actual, dtype=dtype)
+    zero = expected == 0
+    variance = np.abs(actual - expected) / np.where(zero, dtype(1), expected)
+    codes = _tiers(variance, thresholds)
+    # Same rule as check_variance when there is no expected value
+    return np.where(zero, np.where(actual > 0, 3, 0), codes)
+
+
+def assess_portfolio(
+    expected: np.ndarray,
+    actual: np.ndarray,
+    impact_amounts: np.ndarray,
+    segment_ids: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Variance level, escalation level and overlay cap for every portfolio row in
+    one call.
+
+    segment_ids holds SegmentID values. Returns three arrays aligned with the
+    rows: check_variance labels, should_escalate labels, and overlay caps (NaN
+    where none is defined).
+    """
+    return (
+        _VAR_LABEL_ARRAY[_variance_codes(expected, actual)],
+        _ESC_LABELS[_tiers(impact_amounts, _ESC_THRESH)],
+        _OVERLAY_CAP_ARRAY[np.asarray(segment_ids, dtype=np.intp)],
+    )
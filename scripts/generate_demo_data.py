@@ -7,41 +7,62 @@ All files are generated programmatically and placed in data/.
 Usage:
     python scripts/generate_demo_data.py
     python scripts/generate_demo_data.py --output-dir /custom/path
+    python scripts/generate_demo_data.py --bundle   # single data/demo_data.zip
+    python scripts/generate_demo_data.py --only portfolio_risk.db
 
 Gaps embedded:
     1. Macro Overlay Black Box - undocumented manual overlay criteria
     2. Missing Escalation Playbook - undefined/inconsistent escalation thresholds
     3. Legacy Shortcut vs Policy Method - 4q vs 12q, undocumented switching criteria
+
+openpyxl writes the workbook through lxml when it is installed (it is a
+project dependency); without it, saving falls back to the much slower
+pure-Python serializer.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
 import shutil
 import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import orjson
 
-import nbformat
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from openpyxl import Workbook
-from openpyxl.comments import Comment
-from openpyxl.workbook.defined_name import DefinedName
-from pptx import Presentation
-from pptx.util import Inches as PptxInches, Pt as PptxPt
+# The document libraries (openpyxl, python-pptx, python-docx) are imported
+# inside the generator that uses them, so --only runs load just one
 
 
 ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_OUTPUT = ROOT / "data"
+# Every output is a pure function of this file, so runs record its hash plus a
+# sha256 of each file they wrote; a later full run only regenerates outputs that
+# are missing or no longer match, and skips entirely when none do
+SOURCE_HASH = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+STAMP_NAME = ".demo_data_stamp"
+
+
+def _write_raw(path: Path, data: bytes) -> None:
+    """Write bytes straight to a file descriptor, without Python's buffered I/O."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 # ---------------------------------------------------------------------------
 # 1. loss_forecast_model.py
 # ---------------------------------------------------------------------------
-def generate_python_model(output_dir: Path) -> None:
-    content = '''\
+# Static sources are encoded once at import and written as bytes
+_PYTHON_MODEL_SRC = '''\
 """
 Credit Loss Forecasting Model — Q3 2024
 Author: Alice Chen, Risk Analyst
@@ -99,9 +120,11 @@ SEGMENT_LOSS_THRESHOLDS = {
 def load_historical_defaults(db_path: str = DB_PATH) -> pd.DataFrame:
     """Load historical default rates from portfolio_risk.db."""
     conn = sqlite3.connect(db_path)
-    df = pd.read_sql("SELECT * FROM historical_defaults ORDER BY quarter DESC", conn)
+    rows = conn.execute(
+        "SELECT quarter, default_rate FROM historical_defaults ORDER BY quarter DESC"
+    ).fetchall()
     conn.close()
-    return df
+    return pd.DataFrame(rows, columns=["quarter", "default_rate"])
 
 
 def compute_baseline_rate(
@@ -174,21 +197,18 @@ def generate_forecast(db_path: str = DB_PATH) -> pd.DataFrame:
     Output is saved to Q3_2024_forecast.xlsx after manual overlay review.
     """
     defaults_df = load_historical_defaults(db_path)
-    baseline = compute_baseline_rate(defaults_df)
-
-    results = []
-    for segment in SEGMENTS:
-        threshold = SEGMENT_LOSS_THRESHOLDS.get(segment)
-        results.append({
-            "segment": segment,
-            "baseline_rate": round(baseline, 4),
-            "macro_overlay": 0.0,        # Filled in manually by Alice
-            "final_rate": round(baseline, 4),  # Updated after overlay
-            "threshold": threshold,       # May be None — that\'s a problem
-            "rationale": "",              # Alice fills this in (but rarely does)
-        })
+    baseline = round(compute_baseline_rate(defaults_df), 4)
 
-    return pd.DataFrame(results)
+    n = len(SEGMENTS)
+    return pd.DataFrame({
+        "segment": SEGMENTS,
+        "baseline_rate": np.full(n, baseline),
+        "macro_overlay": np.zeros(n),        # Filled in manually by Alice
+        "final_rate": np.full(n, baseline),  # Updated after overlay
+        # May be None — that\'s a problem
+        "threshold": [SEGMENT_LOSS_THRESHOLDS.get(segment) for segment in SEGMENTS],
+        "rationale": [""] * n,               # Alice fills this in (but rarely does)
+    })
 
 
 if __name__ == "__main__":
@@ -196,110 +216,169 @@ if __name__ == "__main__":
     forecast.to_excel(FORECAST_OUTPUT, index=False)
     print(forecast)
 '''
-    (output_dir / "loss_forecast_model.py").write_text(content)
+_PYTHON_MODEL_BYTES = _PYTHON_MODEL_SRC.encode("utf-8")
+
+
+def generate_python_model(output_dir: Path) -> None:
+    _write_raw(output_dir / "loss_forecast_model.py", _PYTHON_MODEL_BYTES)
 
 
 # ---------------------------------------------------------------------------
 # 2. Q3_2024_forecast.xlsx
 # ---------------------------------------------------------------------------
+# Forecast_Summary data rows with their formulas already spelled out: segment,
+# model rate, macro overlay, final rate, reserve impact, rationale, and the
+# comments on the overlay (C) and rationale (F) cells. The output is fixed, so
+# the row numbers and exposures are baked in once at import.
+_FORECAST_ROWS = tuple(
+    (seg, model, overlay, f"=B{i}+C{i}", f"=D{i}*{exposure}", rationale,
+     overlay_note, rationale_note)
+    for i, (seg, model, overlay, rationale, exposure, overlay_note, rationale_note)
+    in enumerate((
+        ("Prime",          0.023, 0.000, "No adjustment needed", 145_000_000,
+         None, None),
+        ("Near Prime",     0.051, 0.012, "",                      82_000_000,
+         "Based on early delinquency signals - AC",
+         "TODO: document rationale before quarter-end"),
+        ("Subprime",       0.124, 0.031, "",                      38_000_000,
+         "Elevated 30-day DQ + macro concerns - AC", None),
+        ("Deep Subprime",  0.221, 0.045, "",                      12_000_000,
+         "New product buffer + macro environment - AC", None),
+    ), start=2)
+)
+
+# Cohort_Tracking rows with the variance formula (F) in place
+_COHORT_ROWS = tuple(
+    (q, v, seg, exp, act, f"=(E{i}-D{i})/D{i}", status)
+    for i, (q, v, seg, exp, act, status) in enumerate((
+        ("Q1-24", "Jan", "Near Prime",  0.042, 0.058, "REVIEW"),
+        ("Q1-24", "Feb", "Near Prime",  0.041, 0.054, "REVIEW"),
+        ("Q1-24", "Mar", "Near Prime",  0.040, 0.043, "OK"),
+        ("Q4-23", "Oct", "Subprime",    0.105, 0.132, "REVIEW"),
+        ("Q4-23", "Nov", "Subprime",    0.108, 0.119, "MONITOR"),
+        ("Q3-23", "Jul", "Deep Sub",    0.195, 0.261, "REVIEW"),
+        ("Q3-23", "Aug", "Deep Sub",    0.201, 0.247, "REVIEW"),
+    ), start=2)
+)
+
+
+# Comments on single cells outside Forecast_Summary, as (text, author). The
+# Comment objects themselves are made per cell: openpyxl binds each to its cell.
+_COHORT_COMMENT = (
+    "Two months >25% variance = overlay trigger per Alice's rule", "Alice Chen",
+)
+_APPROVAL_COMMENT = (
+    "Approval column is frequently left blank — governance gap", "System",
+)
+_NOTES_HEADER_COMMENT = ("Personal reference — not for distribution", "Alice Chen")
+
+_OVERLAY_RANGE = ("OVERLAY_RANGE", "Forecast_Summary!$C$2:$C$5")
+
+_ADJUSTMENT_LOG_ROWS = (
+    ("2024-06-15", "Near Prime",     "+1.2%", "Q1 cohort variance >25%",    "", ""),
+    ("2024-06-15", "Subprime",       "+3.1%", "DQ trend + cohort miss",     "", ""),
+    ("2024-03-01", "Deep Subprime",  "+4.5%", "New product buffer",         "", ""),
+    ("2023-12-01", "Subprime",       "+2.8%", "Macro deterioration",        "", ""),
+)
+
+_ALICE_NOTES_ROWS = (
+    ("Real subprime threshold",  "0.18 (not in any config file)"),
+    ("Real deep_sub threshold",  "0.28 (I set this based on vintage performance)"),
+    ("Overlay cap",              "5% max per segment"),
+    ("Board escalation threshold", "$10M — verbal from CFO, not in policy"),
+    ("When legacy shortcut is OK", "GDP growth > 1.5% and no Fed rate changes"),
+    ("Overlay removal rule",     "3 consecutive months of <10% variance"),
+)
+
+
 def generate_excel_forecast(output_dir: Path) -> None:
-    wb = Workbook()
+    from openpyxl import Workbook
+    from openpyxl.cell import Cell, WriteOnlyCell
+    from openpyxl.comments import Comment
+    from openpyxl.workbook.defined_name import DefinedName
+    from openpyxl.writer.excel import ExcelWriter
+
+    # write_only streams each appended row straight to the sheet XML, so every
+    # row is built up front and commented cells are WriteOnlyCells
+    wb = Workbook(write_only=True)
+
+    def commented(ws, value, text: str, author: str) -> Cell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.comment = Comment(text, author)
+        return cell
+
+    def cells(ws, row: list) -> list[Cell]:
+        # openpyxl reuses a passed-in cell for the plain values after it in the
+        # row, which would copy its comment along; rows with a comment go out
+        # as cells throughout
+        return [v if isinstance(v, Cell) else WriteOnlyCell(ws, value=v) for v in row]
 
     # --- Sheet 1: Forecast_Summary ---
-    ws = wb.active
-    ws.title = "Forecast_Summary"
+    ws = wb.create_sheet("Forecast_Summary")
     headers = ["Segment", "Model Rate", "Macro Overlay", "Final Rate",
                "Reserve Impact ($M)", "Rationale"]
     ws.append(headers)
 
-    data = [
-        ("Prime",          0.023, 0.000, None, None, "No adjustment needed"),
-        ("Near Prime",     0.051, 0.012, None, None, ""),
-        ("Subprime",       0.124, 0.031, None, None, ""),
-        ("Deep Subprime",  0.221, 0.045, None, None, ""),
-    ]
-    exposures = [145_000_000, 82_000_000, 38_000_000, 12_000_000]
-
-    for i, (seg, model, overlay, _, _, rationale) in enumerate(data, start=2):
-        ws.cell(row=i, column=1, value=seg)
-        ws.cell(row=i, column=2, value=model)
-        ws.cell(row=i, column=3, value=overlay)
-        ws.cell(row=i, column=4).value = f"=B{i}+C{i}"  # formula
-        ws.cell(row=i, column=5).value = f"=D{i}*{exposures[i-2]}"  # formula
-        ws.cell(row=i, column=6, value=rationale)
+    for (seg, model, overlay, final, impact, rationale,
+         overlay_note, rationale_note) in _FORECAST_ROWS:
+        if not (overlay_note or rationale_note):
+            ws.append((seg, model, overlay, final, impact, rationale))
+            continue
+        ws.append(cells(ws, [
+            seg,
+            model,
+            (commented(ws, overlay, overlay_note, "Alice Chen")
+             if overlay_note else overlay),
+            final,
+            impact,
+            (commented(ws, rationale, rationale_note, "Alice Chen")
+             if rationale_note else rationale),
+        ]))
 
     # Total row
-    ws.cell(row=6, column=1, value="TOTAL")
-    ws.cell(row=6, column=5).value = "=SUM(E2:E5)"
-
-    # Comments
-    ws["C3"].comment = Comment("Based on early delinquency signals - AC", "Alice Chen")
-    ws["C4"].comment = Comment("Elevated 30-day DQ + macro concerns - AC", "Alice Chen")
-    ws["C5"].comment = Comment("New product buffer + macro environment - AC", "Alice Chen")
-    ws["F3"].comment = Comment("TODO: document rationale before quarter-end", "Alice Chen")
+    ws.append(["TOTAL", None, None, None, "=SUM(E2:E5)"])
 
     # Named range
-    dn = DefinedName("OVERLAY_RANGE", attr_text="Forecast_Summary!$C$2:$C$5")
-    wb.defined_names.add(dn)
+    name, ref = _OVERLAY_RANGE
+    wb.defined_names.add(DefinedName(name, attr_text=ref))
 
     # --- Sheet 2: Cohort_Tracking ---
     ws2 = wb.create_sheet("Cohort_Tracking")
     ws2.append(["Quarter", "Vintage", "Segment", "Expected", "Actual", "Variance", "Status"])
-    cohorts = [
-        ("Q1-24", "Jan", "Near Prime",  0.042, 0.058, None, "REVIEW"),
-        ("Q1-24", "Feb", "Near Prime",  0.041, 0.054, None, "REVIEW"),
-        ("Q1-24", "Mar", "Near Prime",  0.040, 0.043, None, "OK"),
-        ("Q4-23", "Oct", "Subprime",    0.105, 0.132, None, "REVIEW"),
-        ("Q4-23", "Nov", "Subprime",    0.108, 0.119, None, "MONITOR"),
-        ("Q3-23", "Jul", "Deep Sub",    0.195, 0.261, None, "REVIEW"),
-        ("Q3-23", "Aug", "Deep Sub",    0.201, 0.247, None, "REVIEW"),
-    ]
-    for i, (q, v, seg, exp, act, _, status) in enumerate(cohorts, start=2):
-        ws2.cell(row=i, column=1, value=q)
-        ws2.cell(row=i, column=2, value=v)
-        ws2.cell(row=i, column=3, value=seg)
-        ws2.cell(row=i, column=4, value=exp)
-        ws2.cell(row=i, column=5, value=act)
-        ws2.cell(row=i, column=6).value = f"=(E{i}-D{i})/D{i}"
-        ws2.cell(row=i, column=7, value=status)
-
-    ws2["E2"].comment = Comment(
-        "Two months >25% variance = overlay trigger per Alice's rule", "Alice Chen"
-    )
+    first, *rest = _COHORT_ROWS
+    q, v, seg, exp, act, variance, status = first
+    ws2.append(cells(ws2, [
+        q, v, seg, exp,
+        commented(ws2, act, *_COHORT_COMMENT),
+        variance, status,
+    ]))
+    for row in rest:
+        ws2.append(row)
 
     # --- Sheet 3: Adjustment_Log ---
     ws3 = wb.create_sheet("Adjustment_Log")
     ws3.append(["Date", "Segment", "Overlay Applied", "Trigger", "Approved By", "Removal Date"])
-    log_data = [
-        ("2024-06-15", "Near Prime",     "+1.2%", "Q1 cohort variance >25%",    "", ""),
-        ("2024-06-15", "Subprime",       "+3.1%", "DQ trend + cohort miss",     "", ""),
-        ("2024-03-01", "Deep Subprime",  "+4.5%", "New product buffer",         "", ""),
-        ("2023-12-01", "Subprime",       "+2.8%", "Macro deterioration",        "", ""),
-    ]
-    for row in log_data:
-        ws3.append(list(row))
-
-    ws3["E2"].comment = Comment(
-        "Approval column is frequently left blank — governance gap", "System"
-    )
+    first, *rest = _ADJUSTMENT_LOG_ROWS
+    approved_by = commented(ws3, first[4], *_APPROVAL_COMMENT)
+    ws3.append(cells(ws3, [*first[:4], approved_by, first[5]]))
+    for row in rest:
+        ws3.append(row)
 
     # --- Sheet 4: Alice_Notes (HIDDEN) ---
     ws4 = wb.create_sheet("Alice_Notes")
     ws4.sheet_state = "hidden"
-    ws4.append(["Parameter", "Value"])
-    notes = [
-        ("Real subprime threshold",  "0.18 (not in any config file)"),
-        ("Real deep_sub threshold",  "0.28 (I set this based on vintage performance)"),
-        ("Overlay cap",              "5% max per segment"),
-        ("Board escalation threshold", "$10M — verbal from CFO, not in policy"),
-        ("When legacy shortcut is OK", "GDP growth > 1.5% and no Fed rate changes"),
-        ("Overlay removal rule",     "3 consecutive months of <10% variance"),
-    ]
-    for row in notes:
-        ws4.append(list(row))
-    ws4["A1"].comment = Comment("Personal reference — not for distribution", "Alice Chen")
+    ws4.append(cells(ws4, [
+        commented(ws4, "Parameter", *_NOTES_HEADER_COMMENT),
+        "Value",
+    ]))
+    for row in _ALICE_NOTES_ROWS:
+        ws4.append(row)
 
-    wb.save(output_dir / "Q3_2024_forecast.xlsx")
+    # wb.save() deflates at the default level 6; these sheets are a few KB of
+    # XML, so level 1 costs almost nothing in size and much less CPU
+    with ZipFile(output_dir / "Q3_2024_forecast.xlsx", "w", ZIP_DEFLATED,
+                 compresslevel=1, allowZip64=True) as archive:
+        ExcelWriter(wb, archive).save()
 
 
 # ---------------------------------------------------------------------------
@@ -310,16 +389,58 @@ def generate_sqlite_db(output_dir: Path) -> None:
     if db_path.exists():
         db_path.unlink()
 
-    conn = sqlite3.connect(str(db_path))
+    # Built in memory inside one transaction, then copied to disk in a single
+    # backup pass instead of journaling/syncing each statement
+    conn = sqlite3.connect(":memory:")
     c = conn.cursor()
-
-    # Table: historical_defaults (16 rows = 4 years, Q1-2021 to Q4-2024)
-    c.execute("""
+    # Whole schema in one call; executescript commits first, so it runs before
+    # the data transaction opens
+    c.executescript("""
         CREATE TABLE historical_defaults (
             quarter TEXT PRIMARY KEY,
             default_rate REAL NOT NULL
-        )
+        );
+
+        CREATE TABLE loan_cohorts (
+            segment TEXT PRIMARY KEY,
+            exposure_ead REAL NOT NULL,
+            lgd REAL NOT NULL,
+            avg_fico INTEGER,
+            avg_dti REAL
+        );
+
+        CREATE TABLE macro_quarterly (
+            quarter TEXT PRIMARY KEY,
+            gdp_growth REAL,
+            unemployment_rate REAL,
+            fed_funds_rate REAL,
+            consumer_sentiment REAL
+        );
+
+        CREATE TABLE escalation_thresholds (
+            level TEXT PRIMARY KEY,
+            dollar_threshold REAL,
+            approval_required TEXT,
+            last_updated TEXT
+        );
+
+        CREATE TABLE policy_snapshot (
+            as_of_quarter TEXT PRIMARY KEY,
+            lookback_window INTEGER,
+            overlay_cap REAL,
+            methodology TEXT
+        );
+
+        CREATE TABLE capital_position (
+            quarter TEXT PRIMARY KEY,
+            total_capital REAL,
+            risk_weighted_assets REAL,
+            capital_ratio REAL
+        );
     """)
+    c.execute("BEGIN")
+
+    # Table: historical_defaults (16 rows = 4 years, Q1-2021 to Q4-2024)
     defaults = [
         ("Q1-2021", 0.032), ("Q2-2021", 0.034), ("Q3-2021", 0.031), ("Q4-2021", 0.035),
         ("Q1-2022", 0.038), ("Q2-2022", 0.041), ("Q3-2022", 0.039), ("Q4-2022", 0.043),
@@ -329,15 +450,6 @@ def generate_sqlite_db(output_dir: Path) -> None:
     c.executemany("INSERT INTO historical_defaults VALUES (?, ?)", defaults)
 
     # Table: loan_cohorts (4 segments)
-    c.execute("""
-        CREATE TABLE loan_cohorts (
-            segment TEXT PRIMARY KEY,
-            exposure_ead REAL NOT NULL,
-            lgd REAL NOT NULL,
-            avg_fico INTEGER,
-            avg_dti REAL
-        )
-    """)
     cohorts = [
         ("prime",          145_000_000, 0.38, 744, 0.22),
         ("near_prime",      82_000_000, 0.47, 692, 0.28),
@@ -347,15 +459,6 @@ def generate_sqlite_db(output_dir: Path) -> None:
     c.executemany("INSERT INTO loan_cohorts VALUES (?, ?, ?, ?, ?)", cohorts)
 
     # Table: macro_quarterly (4 recent quarters)
-    c.execute("""
-        CREATE TABLE macro_quarterly (
-            quarter TEXT PRIMARY KEY,
-            gdp_growth REAL,
-            unemployment_rate REAL,
-            fed_funds_rate REAL,
-            consumer_sentiment REAL
-        )
-    """)
     macro = [
         ("Q1-2024", 1.6, 3.9, 5.25, 67.4),
         ("Q2-2024", 1.4, 4.0, 5.25, 65.2),
@@ -365,14 +468,6 @@ def generate_sqlite_db(output_dir: Path) -> None:
     c.executemany("INSERT INTO macro_quarterly VALUES (?, ?, ?, ?, ?)", macro)
 
     # Table: escalation_thresholds — board row has NULLs (Gap 2)
-    c.execute("""
-        CREATE TABLE escalation_thresholds (
-            level TEXT PRIMARY KEY,
-            dollar_threshold REAL,
-            approval_required TEXT,
-            last_updated TEXT
-        )
-    """)
     thresholds = [
         ("routine",        0,         "analyst",        "2024-01-15"),
         ("risk_committee", 2_000_000, "risk_committee", "2024-01-15"),
@@ -382,28 +477,12 @@ def generate_sqlite_db(output_dir: Path) -> None:
     c.executemany("INSERT INTO escalation_thresholds VALUES (?, ?, ?, ?)", thresholds)
 
     # Table: policy_snapshot — says 12-quarter window (Gap 3)
-    c.execute("""
-        CREATE TABLE policy_snapshot (
-            as_of_quarter TEXT PRIMARY KEY,
-            lookback_window INTEGER,
-            overlay_cap REAL,
-            methodology TEXT
-        )
-    """)
     c.execute(
         "INSERT INTO policy_snapshot VALUES (?, ?, ?, ?)",
         ("Q3-2024", 12, 0.05, "12-quarter rolling average per CR-POL-2024-003"),
     )
 
     # Table: capital_position (4 quarters)
-    c.execute("""
-        CREATE TABLE capital_position (
-            quarter TEXT PRIMARY KEY,
-            total_capital REAL,
-            risk_weighted_assets REAL,
-            capital_ratio REAL
-        )
-    """)
     capital = [
         ("Q1-2024", 2_750_000_000, 21_200_000_000, 0.1297),
         ("Q2-2024", 2_758_000_000, 21_270_000_000, 0.1297),
@@ -413,14 +492,16 @@ def generate_sqlite_db(output_dir: Path) -> None:
     c.executemany("INSERT INTO capital_position VALUES (?, ?, ?, ?)", capital)
 
     conn.commit()
+    disk = sqlite3.connect(str(db_path))
+    conn.backup(disk)
+    disk.close()
     conn.close()
 
 
 # ---------------------------------------------------------------------------
 # 4. risk_queries.sql
 # ---------------------------------------------------------------------------
-def generate_sql_queries(output_dir: Path) -> None:
-    content = """\
+_SQL_QUERIES_SRC = """\
 -- risk_queries.sql
 -- Q3 2024 Credit Loss Forecast Workstream
 -- Author: Alice Chen
@@ -497,13 +578,46 @@ SELECT *
 FROM escalation_thresholds
 ORDER BY dollar_threshold;
 """
-    (output_dir / "risk_queries.sql").write_text(content)
+_SQL_QUERIES_BYTES = _SQL_QUERIES_SRC.encode("utf-8")
+
+
+def generate_sql_queries(output_dir: Path) -> None:
+    _write_raw(output_dir / "risk_queries.sql", _SQL_QUERIES_BYTES)
 
 
 # ---------------------------------------------------------------------------
 # 5. board_risk_presentation.pptx
 # ---------------------------------------------------------------------------
+def _fill_pptx_table(tbl, rows: list) -> None:
+    """Write rows of strings into a python-pptx table, one row element at a time.
+
+    tbl.cell(i, j) re-queries the row and cell elements on every call; walking
+    tbl.rows resolves each row once. Empty strings are skipped, as the cell
+    already holds a single empty paragraph.
+    """
+    for tbl_row, values in zip(tbl.rows, rows):
+        for cell, val in zip(tbl_row.cells, values):
+            if val:
+                cell.text_frame.paragraphs[0].add_run().text = val
+
+
+def _append_bullets(tf, bullets: list[str], level: int = 1) -> None:
+    """Append one paragraph per bullet at the given indent level.
+
+    Builds the <a:p> elements on the text body directly rather than going
+    through add_paragraph() and the paragraph proxies' text/level setters.
+    """
+    txBody = tf._txBody
+    for bullet in bullets:
+        p = txBody.add_p()
+        p.get_or_add_pPr().lvl = level
+        p.append_text(bullet)
+
+
 def generate_pptx_deck(output_dir: Path) -> None:
+    from pptx import Presentation
+    from pptx.util import Inches as PptxInches
+
     prs = Presentation()
     prs.slide_width = PptxInches(13.333)
     prs.slide_height = PptxInches(7.5)
@@ -529,8 +643,6 @@ def generate_pptx_deck(output_dir: Path) -> None:
                                          PptxInches(11), PptxInches(3.5))
     tbl = tbl_shape.table
     headers = ["Segment", "Model Rate", "Adjusted Rate", "Reserve Impact ($M)", "Overlay"]
-    for j, h in enumerate(headers):
-        tbl.cell(0, j).text = h
     data = [
         ("Prime",         "2.3%",  "2.3%",  "$3.3M",  "0.0%"),
         ("Near Prime",    "5.1%",  "6.3%",  "$5.2M",  "+1.2%"),
@@ -538,9 +650,7 @@ def generate_pptx_deck(output_dir: Path) -> None:
         ("Deep Subprime", "22.1%", "26.6%", "$3.2M",  "+4.5%"),
         ("TOTAL",         "",      "",      "$17.6M", ""),
     ]
-    for i, row in enumerate(data, start=1):
-        for j, val in enumerate(row):
-            tbl.cell(i, j).text = val
+    _fill_pptx_table(tbl, [headers, *data])
 
     notes2 = slide2.notes_slide
     notes2.notes_text_frame.text = (
@@ -555,15 +665,12 @@ def generate_pptx_deck(output_dir: Path) -> None:
     body = slide3.placeholders[1]
     tf = body.text_frame
     tf.text = "Macroeconomic factors considered:"
-    for bullet in [
+    _append_bullets(tf, [
         "GDP growth trending down (1.6% → 0.8% over 2024)",
         "Unemployment rising (3.9% → 4.5%)",
         "Fed rate easing cycle beginning (5.25% → 4.75%)",
         "Consumer sentiment declining (67.4 → 61.1)",
-    ]:
-        p = tf.add_paragraph()
-        p.text = bullet
-        p.level = 1
+    ])
     p2 = tf.add_paragraph()
     p2.text = "\nOverlays reflect analyst judgment based on these indicators."
 
@@ -581,15 +688,12 @@ def generate_pptx_deck(output_dir: Path) -> None:
     body4 = slide4.placeholders[1]
     tf4 = body4.text_frame
     tf4.text = "Current escalation framework:"
-    for bullet in [
+    _append_bullets(tf4, [
         "< $2M impact: Analyst sign-off (routine)",
         "$2M - $5M impact: Risk Committee review",
         "> $5M impact: CFO approval required",
         "Board notification threshold: Under review",
-    ]:
-        p = tf4.add_paragraph()
-        p.text = bullet
-        p.level = 1
+    ])
     p3 = tf4.add_paragraph()
     p3.text = "\nAll overlays reviewed at weekly Risk Committee sync."
 
@@ -606,16 +710,13 @@ def generate_pptx_deck(output_dir: Path) -> None:
     body5 = slide5.placeholders[1]
     tf5 = body5.text_frame
     tf5.text = "Key action items:"
-    for bullet in [
+    _append_bullets(tf5, [
         "Model recalibration scheduled for Q1 2025",
         "Document overlay decision criteria (model_methodology.docx Sections 4-5)",
         "Formalize board notification threshold in policy",
         "Transition planning: train Marcus Park as backup analyst",
         "Reconcile legacy vs. policy-compliant parameter differences",
-    ]:
-        p = tf5.add_paragraph()
-        p.text = bullet
-        p.level = 1
+    ])
 
     notes5 = slide5.notes_slide
     notes5.notes_text_frame.text = (
@@ -631,15 +732,31 @@ def generate_pptx_deck(output_dir: Path) -> None:
 # ---------------------------------------------------------------------------
 # 6. model_methodology.docx
 # ---------------------------------------------------------------------------
+def _add_docx_table(doc, rows: list, style: str = "Table Grid"):
+    """Append a table holding rows of strings to a python-docx document.
+
+    add_table parses the whole blank <w:tbl> in one go; the cells are then
+    filled by walking the <w:tr>/<w:tc> elements directly. tbl.cell(i, j)
+    rebuilds the flat cell list on every call and .text clears and recreates
+    the paragraph, so both are skipped.
+    """
+    tbl = doc.add_table(rows=len(rows), cols=len(rows[0]))
+    tbl.style = style
+    for tr, values in zip(tbl._tbl.tr_lst, rows):
+        for tc, val in zip(tr.tc_lst, values):
+            tc.p_lst[0].add_r().text = val
+    return tbl
+
+
 def generate_docx_methodology(output_dir: Path) -> None:
+    from docx import Document
+
     doc = Document()
 
     # Title
     doc.add_heading("Credit Loss Forecasting Model — Methodology Document", level=0)
 
     # Metadata table
-    meta = doc.add_table(rows=5, cols=2)
-    meta.style = "Table Grid"
     fields = [
         ("Document ID", "CR-METH-2024-001"),
         ("Version", "1.3 (DRAFT)"),
@@ -647,9 +764,7 @@ def generate_docx_methodology(output_dir: Path) -> None:
         ("Last Review", "July 2024"),
         ("Status", "INCOMPLETE — Sections 4 and 5 require documentation"),
     ]
-    for i, (k, v) in enumerate(fields):
-        meta.cell(i, 0).text = k
-        meta.cell(i, 1).text = v
+    _add_docx_table(doc, fields)
 
     doc.add_paragraph()
 
@@ -695,21 +810,13 @@ def generate_docx_methodology(output_dir: Path) -> None:
         "when conditions deviate from baseline assumptions."
     )
 
-    tbl = doc.add_table(rows=5, cols=3)
-    tbl.style = "Table Grid"
-    tbl.cell(0, 0).text = "Indicator"
-    tbl.cell(0, 1).text = "Source"
-    tbl.cell(0, 2).text = "Update Frequency"
     indicators = [
         ("GDP growth rate", "BEA", "Quarterly"),
         ("Unemployment rate", "BLS", "Monthly"),
         ("Federal funds rate", "Federal Reserve", "As announced"),
         ("Consumer sentiment", "U. of Michigan", "Monthly"),
     ]
-    for i, (ind, src, freq) in enumerate(indicators, start=1):
-        tbl.cell(i, 0).text = ind
-        tbl.cell(i, 1).text = src
-        tbl.cell(i, 2).text = freq
+    _add_docx_table(doc, [("Indicator", "Source", "Update Frequency"), *indicators])
 
     # Section 4: Overlay Decision Framework (INCOMPLETE — Gap 1)
     doc.add_heading("4. Overlay Decision Framework", level=1)
@@ -746,21 +853,13 @@ def generate_docx_methodology(output_dir: Path) -> None:
         "Threshold configuration is in loss_forecast_model.py. Current thresholds:"
     )
 
-    etbl = doc.add_table(rows=5, cols=3)
-    etbl.style = "Table Grid"
-    etbl.cell(0, 0).text = "Level"
-    etbl.cell(0, 1).text = "Dollar Impact"
-    etbl.cell(0, 2).text = "Approval Required"
     esc_data = [
         ("Routine", "< $2M", "Analyst sign-off"),
         ("Significant", "$2M – $5M", "Risk Committee"),
         ("Major", "> $5M", "CFO approval"),
         ("Board notification", "See Alice Chen", "TBD"),
     ]
-    for i, (lvl, impact, approval) in enumerate(esc_data, start=1):
-        etbl.cell(i, 0).text = lvl
-        etbl.cell(i, 1).text = impact
-        etbl.cell(i, 2).text = approval
+    _add_docx_table(doc, [("Level", "Dollar Impact", "Approval Required"), *esc_data])
 
     doc.add_paragraph(
         "Note: Segment-level loss rate thresholds that trigger escalation "
@@ -778,21 +877,13 @@ def generate_docx_methodology(output_dir: Path) -> None:
 
     # Section 7: Review History
     doc.add_heading("7. Review History", level=1)
-    rtbl = doc.add_table(rows=5, cols=3)
-    rtbl.style = "Table Grid"
-    rtbl.cell(0, 0).text = "Version"
-    rtbl.cell(0, 1).text = "Date"
-    rtbl.cell(0, 2).text = "Changes"
     revisions = [
         ("1.0", "2023-06-01", "Initial draft"),
         ("1.1", "2023-12-15", "Added macro adjustment section"),
         ("1.2", "2024-03-01", "Updated escalation thresholds"),
         ("1.3", "2024-07-15", "Marked Sections 4 & 5 incomplete"),
     ]
-    for i, (ver, dt, changes) in enumerate(revisions, start=1):
-        rtbl.cell(i, 0).text = ver
-        rtbl.cell(i, 1).text = dt
-        rtbl.cell(i, 2).text = changes
+    _add_docx_table(doc, [("Version", "Date", "Changes"), *revisions])
 
     doc.save(output_dir / "model_methodology.docx")
 
@@ -800,65 +891,89 @@ def generate_docx_methodology(output_dir: Path) -> None:
 # ---------------------------------------------------------------------------
 # 7. stress_testing.ipynb
 # ---------------------------------------------------------------------------
-def generate_notebook(output_dir: Path) -> None:
-    nb = nbformat.v4.new_notebook()
-    nb.metadata["kernelspec"] = {
-        "display_name": "Python 3",
-        "language": "python",
-        "name": "python3",
+def _nb_cell(cell_type: str, source: str, **fields) -> dict:
+    """One nbformat v4.5 cell, with source split into lines as Jupyter stores it.
+
+    The cell id is derived from the source, so regenerating the notebook
+    doesn't churn ids the way nbformat's random ones do.
+    """
+    return {
+        "cell_type": cell_type,
+        "id": hashlib.blake2b(source.encode("utf-8"), digest_size=4).hexdigest(),
+        "metadata": {},
+        "source": source.splitlines(keepends=True),
+        **fields,
     }
 
+
+def _markdown_cell(source: str) -> dict:
+    return _nb_cell("markdown", source)
+
+
+def _code_cell(source: str, stdout: str | None = None) -> dict:
+    outputs = [{
+        "name": "stdout",
+        "output_type": "stream",
+        "text": stdout.splitlines(keepends=True),
+    }] if stdout else []
+    return _nb_cell("code", source, execution_count=None, outputs=outputs)
+
+
+# The notebook is fixed and known-good, so it is built once at import as a
+# plain dict and encoded straight to JSON bytes (sorted keys, as Jupyter writes
+# them); going through nbformat.write would re-validate every cell against the
+# schema on every run
+_NOTEBOOK_CELLS = [
     # Cell 1: Title (markdown)
-    nb.cells.append(nbformat.v4.new_markdown_cell(
+    _markdown_cell(
         "# Stress Testing — Q3 2024\n\n"
         "Applies macro stress scenarios to baseline loss forecast.\n\n"
         "Data source: `portfolio_risk.db`\n"
         "Model reference: `loss_forecast_model.py`\n"
         "Policy reference: `model_methodology.docx`"
-    ))
+    ),
 
     # Cell 2: Imports (code)
-    c2 = nbformat.v4.new_code_cell(
+    _code_cell(
         "import sqlite3\n"
         "import pandas as pd\n"
         "import numpy as np\n\n"
         "DB_PATH = \"portfolio_risk.db\"\n"
         "conn = sqlite3.connect(DB_PATH)"
-    )
-    nb.cells.append(c2)
+    ),
 
     # Cell 3: Load defaults + compute baseline (code)
-    c3 = nbformat.v4.new_code_cell(
+    _code_cell(
         "# Load historical defaults\n"
         "defaults = pd.read_sql(\n"
         "    \"SELECT * FROM historical_defaults ORDER BY quarter DESC\", conn\n"
         ")\n\n"
         "# Use 4-quarter average for baseline (faster iteration during stress runs)\n"
         "baseline_rate = defaults.head(4)[\"default_rate\"].mean()\n"
-        "print(f\"Baseline rate (4Q avg): {baseline_rate:.4f}\")"
-    )
-    c3.outputs = [nbformat.v4.new_output(
-        output_type="stream", name="stdout",
-        text="Baseline rate (4Q avg): 0.0585\n",
-    )]
-    nb.cells.append(c3)
+        "print(f\"Baseline rate (4Q avg): {baseline_rate:.4f}\")",
+        stdout="Baseline rate (4Q avg): 0.0585\n",
+    ),
 
     # Cell 4: Stress scenarios (code)
-    c4 = nbformat.v4.new_code_cell(
+    _code_cell(
         "# Macro stress scenarios\n"
-        "# NOTE: Overlay factors are Alice's expert estimates — not from any formal model\n"
+        "# NOTE: Overlay factors are Alice's expert estimates — "
+        "not from any formal model\n"
         "#       These have never been peer-reviewed or validated.\n"
         "STRESS_SCENARIOS = {\n"
-        "    \"base\":                {\"gdp_shock\": 0.0,  \"unemp_shock\": 0.0, \"overlay\": 0.000},\n"
-        "    \"mild_downturn\":       {\"gdp_shock\": -0.5, \"unemp_shock\": 0.3, \"overlay\": 0.015},\n"
-        "    \"moderate_recession\":  {\"gdp_shock\": -1.5, \"unemp_shock\": 1.0, \"overlay\": 0.035},\n"
-        "    \"severe_recession\":    {\"gdp_shock\": -3.0, \"unemp_shock\": 2.5, \"overlay\": 0.050},\n"
+        "    \"base\":                "
+        "{\"gdp_shock\": 0.0,  \"unemp_shock\": 0.0, \"overlay\": 0.000},\n"
+        "    \"mild_downturn\":       "
+        "{\"gdp_shock\": -0.5, \"unemp_shock\": 0.3, \"overlay\": 0.015},\n"
+        "    \"moderate_recession\":  "
+        "{\"gdp_shock\": -1.5, \"unemp_shock\": 1.0, \"overlay\": 0.035},\n"
+        "    \"severe_recession\":    "
+        "{\"gdp_shock\": -3.0, \"unemp_shock\": 2.5, \"overlay\": 0.050},\n"
         "}"
-    )
-    nb.cells.append(c4)
+    ),
 
     # Cell 5: Run stress scenarios (code)
-    c5 = nbformat.v4.new_code_cell(
+    _code_cell(
         "# Run stress scenarios\n"
         "results = []\n"
         "for name, params in STRESS_SCENARIOS.items():\n"
@@ -870,47 +985,61 @@ def generate_notebook(output_dir: Path) -> None:
         "        \"stressed_rate\": round(adjusted_rate, 4),\n"
         "    })\n\n"
         "stress_df = pd.DataFrame(results)\n"
-        "print(stress_df.to_string(index=False))"
-    )
-    c5.outputs = [nbformat.v4.new_output(
-        output_type="stream", name="stdout",
-        text=(
+        "print(stress_df.to_string(index=False))",
+        stdout=(
             "           scenario  baseline  overlay  stressed_rate\n"
             "               base    0.0585    0.000         0.0585\n"
             "      mild_downturn    0.0585    0.015         0.0735\n"
             "  moderate_recession    0.0585    0.035         0.0935\n"
             "   severe_recession    0.0585    0.050         0.1085\n"
         ),
-    )]
-    nb.cells.append(c5)
+    ),
 
     # Cell 6: Load forecast for comparison (code)
-    c6 = nbformat.v4.new_code_cell(
+    _code_cell(
         "# Compare with actual forecast (Alice's manual overlays)\n"
         "forecast_df = pd.read_excel(\"Q3_2024_forecast.xlsx\")\n"
         "print(forecast_df)"
-    )
-    nb.cells.append(c6)
+    ),
 
     # Cell 7: Notes (markdown)
-    nb.cells.append(nbformat.v4.new_markdown_cell(
+    _markdown_cell(
         "## Notes\n\n"
         "- Baseline uses **4-quarter average** for speed — policy says 12-quarter\n"
         "  (see `risk_queries.sql` for both variants)\n"
-        "- Overlay factors in `STRESS_SCENARIOS` are Alice's expert judgment estimates\n"
+        "- Overlay factors in `STRESS_SCENARIOS` are Alice's expert judgment "
+        "estimates\n"
         "- **TODO:** Get overlay factors peer-reviewed before year-end\n"
-        "- The severe recession overlay (+5%) matches the overlay cap in `portfolio_risk.db`\n"
+        "- The severe recession overlay (+5%) matches the overlay cap in "
+        "`portfolio_risk.db`\n"
         "  (`policy_snapshot.overlay_cap = 0.05`)"
-    ))
+    ),
+]
+_NOTEBOOK_BYTES = orjson.dumps(
+    {
+        "cells": _NOTEBOOK_CELLS,
+        "metadata": {
+            "kernelspec": {
+                "display_name": "Python 3",
+                "language": "python",
+                "name": "python3",
+            },
+        },
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    },
+    option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+)
 
-    nbformat.write(nb, output_dir / "stress_testing.ipynb")
+
+def generate_notebook(output_dir: Path) -> None:
+    _write_raw(output_dir / "stress_testing.ipynb", _NOTEBOOK_BYTES)
 
 
 # ---------------------------------------------------------------------------
 # 8. run_notes.txt
 # ---------------------------------------------------------------------------
-def generate_run_notes(output_dir: Path) -> None:
-    content = """\
+_RUN_NOTES_SRC = """\
 RISK FORECAST RUN NOTES — Q3 2024
 ===================================
 Alice Chen — last updated Sept 20, 2024
@@ -963,42 +1092,126 @@ TODO BEFORE LEAVING:
 - [ ] Add approval tracking to Q3_2024_forecast.xlsx (column E always empty)
 - [ ] Reconcile loss_forecast_model.py with policy-approved parameters
 """
-    (output_dir / "run_notes.txt").write_text(content)
+_RUN_NOTES_BYTES = _RUN_NOTES_SRC.encode("utf-8")
+
+
+def generate_run_notes(output_dir: Path) -> None:
+    _write_raw(output_dir / "run_notes.txt", _RUN_NOTES_BYTES)
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Generate demo data for Golden Gate")
-    parser.add_argument(
-        "--output-dir", type=Path, default=DEFAULT_OUTPUT,
-        help="Directory to write generated files (default: data/)",
+GENERATORS = [
+    ("loss_forecast_model.py",       generate_python_model),
+    ("Q3_2024_forecast.xlsx",        generate_excel_forecast),
+    ("portfolio_risk.db",            generate_sqlite_db),
+    ("risk_queries.sql",             generate_sql_queries),
+    ("board_risk_presentation.pptx", generate_pptx_deck),
+    ("model_methodology.docx",       generate_docx_methodology),
+    ("stress_testing.ipynb",         generate_notebook),
+    ("run_notes.txt",               generate_run_notes),
+]
+
+
+def _file_sha256(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _load_stamp(output_dir: Path) -> dict[str, str]:
+    """Output name -> sha256 recorded for the current SOURCE_HASH ({} if none)."""
+    try:
+        stamp = orjson.loads((output_dir / STAMP_NAME).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+    if not isinstance(stamp, dict) or stamp.get("source") != SOURCE_HASH:
+        return {}
+    return stamp.get("files", {})
+
+
+def _stale_outputs(output_dir: Path) -> list[str]:
+    """Outputs that are missing or differ from what the last run wrote."""
+    recorded = _load_stamp(output_dir)
+    stale = []
+    for name, _ in GENERATORS:
+        path = output_dir / name
+        if (
+            name not in recorded
+            or not path.is_file()
+            or _file_sha256(path) != recorded[name]
+        ):
+            stale.append(name)
+    return stale
+
+
+def _write_stamp(output_dir: Path, names: list[str]) -> None:
+    files = _load_stamp(output_dir)
+    files.update((name, _file_sha256(output_dir / name)) for name in names)
+    stamp = {"source": SOURCE_HASH, "files": files}
+    (output_dir / STAMP_NAME).write_bytes(
+        orjson.dumps(stamp, option=orjson.OPT_SORT_KEYS)
     )
-    args = parser.parse_args()
 
-    output_dir: Path = args.output_dir
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    generators = [
-        ("loss_forecast_model.py",       generate_python_model),
-        ("Q3_2024_forecast.xlsx",        generate_excel_forecast),
-        ("portfolio_risk.db",            generate_sqlite_db),
-        ("risk_queries.sql",             generate_sql_queries),
-        ("board_risk_presentation.pptx", generate_pptx_deck),
-        ("model_methodology.docx",       generate_docx_methodology),
-        ("stress_testing.ipynb",         generate_notebook),
-        ("run_notes.txt",               generate_run_notes),
-    ]
+def _generate_all(output_dir: Path, only: list[str] | None = None) -> list[str]:
+    generators = [(name, fn) for name, fn in GENERATORS if not only or name in only]
 
     print(f"Generating {len(generators)} demo files in {output_dir}/\n")
-    for name, gen_fn in generators:
-        gen_fn(output_dir)
+    # Generators are independent and mostly CPU-bound XML/zip serialization
+    # under the GIL, so they run in separate processes
+    with ProcessPoolExecutor() as pool:
+        futures = [pool.submit(gen_fn, output_dir) for _, gen_fn in generators]
+    for (name, _), future in zip(generators, futures):
+        future.result()
         fpath = output_dir / name
         size = fpath.stat().st_size
         print(f"  [OK] {name:<35s} ({size:>8,d} bytes)")
 
     print(f"\nDone. {len(generators)} files generated.")
+    return [name for name, _ in generators]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate demo data for Golden Gate")
+    parser.add_argument(
+        "--output-dir", type=Path, default=DEFAULT_OUTPUT,
+        help="Directory to write generated files (default: data/)",
+    )
+    parser.add_argument(
+        "--only", nargs="+", metavar="FILE", choices=[name for name, _ in GENERATORS],
+        help="Generate only these files (e.g. portfolio_risk.db)",
+    )
+    parser.add_argument(
+        "--bundle", action="store_true",
+        help="Write a single demo_data.zip into the output directory instead of "
+             "loose files",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Regenerate even if the outputs are up to date with this script",
+    )
+    args = parser.parse_args()
+
+    output_dir: Path = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if args.bundle:
+        # Files are staged in a temp dir so the output directory only gains one entry
+        with tempfile.TemporaryDirectory() as staging:
+            _generate_all(Path(staging), args.only)
+            archive = shutil.make_archive(str(output_dir / "demo_data"), "zip", staging)
+        print(f"Bundled into {archive}")
+    elif args.only:
+        _write_stamp(output_dir, _generate_all(output_dir, args.only))
+    else:
+        stale = None if args.force else _stale_outputs(output_dir)
+        if stale == []:
+            print(
+                f"Demo files in {output_dir}/ are up to date "
+                "(use --force to regenerate)"
+            )
+            return
+        _write_stamp(output_dir, _generate_all(output_dir, stale))
 
 
 if __name__ == "__main__":
@@ -36,7 +36,7 @@ const PROPOSED_CHANGES: ProposedChange[] = [
     fileName: 'loss_model.py',
     fileIcon: '\uD83D\uDC0D',
     fileType: 'python',
-    location: 'Lines 66-68',
+    location: 'Lines 78-80',
     issue: 'TODO comment indicates overlay logic is undocumented',
     currentCode: `    # TODO: Manual overlay logic not implemented
     # Analyst applies judgment adjustments manually
@@ -64,23 +64,23 @@ const PROPOSED_CHANGES: ProposedChange[] = [
     fileName: 'threshold_config.py',
     fileIcon: '\uD83D\uDC0D',
     fileType: 'config',
-    location: 'Lines 10-18',
+    location: 'Lines 19-27',
     issue: 'Missing threshold values for subprime and deep_subprime segments',
-    currentCode: `SEGMENT_THRESHOLDS = {
+    currentCode: `SEGMENT_THRESHOLDS = MappingProxyType({
     "prime": 0.03,        # 3% loss rate - well documented
     "near_prime": 0.07,   # 7% loss rate - well documented
     "subprime": 0.15,     # 15% - but Alice uses different number?
     "deep_subprime": None # No threshold set - ask Alice
-}
+})
 
 # Note: Alice knows the real thresholds for subprime and deep_subprime
 # They change based on portfolio composition`,
-    proposedCode: `SEGMENT_THRESHOLDS = {
+    proposedCode: `SEGMENT_THRESHOLDS = MappingProxyType({
     "prime": 0.03,        # 3% loss rate
     "near_prime": 0.07,   # 7% loss rate
     "subprime": 0.18,     # 18% loss rate (per Alice Chen, Q4 2024)
     "deep_subprime": 0.28 # 28% loss rate (per Alice Chen, Q4 2024)
-}
+})
 
 # THRESHOLD UPDATE PROTOCOL (documented from Alice Chen):
 # - Thresholds are DYNAMIC, not static - recalculate quarterly
@@ -98,20 +98,20 @@ const PROPOSED_CHANGES: ProposedChange[] = [
     fileName: 'threshold_config.py',
     fileIcon: '\uD83D\uDC0D',
     fileType: 'config',
-    location: 'Lines 48-53',
+    location: 'Lines 57-62',
     issue: 'Missing overlay cap for deep_subprime segment',
-    currentCode: `OVERLAY_CAPS = {
+    currentCode: `OVERLAY_CAPS = MappingProxyType({
     "prime": 0.01,        # Max 1% overlay
     "near_prime": 0.02,   # Max 2% overlay
     "subprime": 0.05,     # Max 5% overlay
     "deep_subprime": None # No cap defined - Alice decides
-}`,
-    proposedCode: `OVERLAY_CAPS = {
+})`,
+    proposedCode: `OVERLAY_CAPS = MappingProxyType({
     "prime": 0.01,        # Max 1% overlay
     "near_prime": 0.02,   # Max 2% overlay
     "subprime": 0.05,     # Max 5% overlay - reassess strategy if exceeded
     "deep_subprime": 0.05 # Max 5% overlay - same cap applies per Alice
-}
+})
 
 # NOTE: If overlay would exceed 5% for ANY segment, this indicates
 # the segment strategy needs reassessment rather than continued adjustment.
@@ -325,7 +325,7 @@ Deep subprime: 28% loss rate
 These aren't hardcoded because they change quarterly based on portfolio composition. You'll want to recalculate them at quarter-end, especially after marketing campaigns or market entry/exit events.
 
 Sources:
-[[source:threshold_config.py|Lines 23-41]]
+[[source:threshold_config.py|Lines 29-53]]
 [[source:Conversation|Threshold Calibration]]`,
 
   'overlay': `Alice applies overlays when she sees early delinquency signals the model hasn't caught.
@@ -339,7 +339,7 @@ Every 10% increase in early delinquencies adds 1% to loss forecast (capped at 5%
 
 Sources:
 [[source:Conversation|Decision Triggers]]
-[[source:loss_model.py|Lines 48-67]]
+[[source:loss_model.py|Lines 60-79]]
 [[source:Knowledge Memo|Key Decision Points]]`,
 
   'approval': `Here's the complete approval workflow:
@@ -359,7 +359,7 @@ Expedited process available when weekly sync is too far out - email committee fo
 Sources:
 [[source:Escalation_Policy.md|Section 4.3]]
 [[source:Conversation|Approval Workflow]]
-[[source:threshold_config.py|Lines 12-18]]`,
+[[source:threshold_config.py|Lines 21-27]]`,
 
   'backup': `Primary Backup: Marcus Thompson (Risk Analytics, ext. 4589)
 
@@ -404,7 +404,7 @@ Key Question: Is this a temporary blip or sustained pattern? Alice recommended w
 
 Sources:
 [[source:Conversation|Decision Triggers]]
-[[source:threshold_config.py|Lines 23-41]]
+[[source:threshold_config.py|Lines 29-53]]
 [[source:Escalation_Policy.md|Section 4]]
 [[source:Q3_Loss_Forecast.xlsx|Sheet: Adjustments]]`,
 };